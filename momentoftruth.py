@@ -1,9 +1,38 @@
 import tkinter as tk
 from tkinter import ttk
 import socket
+import select
 import struct
 import time
 import threading
+import queue
+import collections
+import itertools
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# Pre-compiled Modbus framing formats
+_MBAP = struct.Struct('>HHHB')     # Transaction ID, Protocol ID, Length, Unit ID
+_SHORT_FRAME = struct.Struct('>HHHBBHH')  # MBAP + 5-byte PDU (FC 0x03/0x06) packed in one call
+_PDU_WMR = struct.Struct('>BHHB')  # Function Code, Address, Quantity, Byte Count (FC 0x10)
+_U16 = struct.Struct('>H')
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")  # Not available on Windows
+MODBUS_MAX_ADU = 260               # Max Modbus TCP frame size (7-byte MBAP + 253-byte PDU)
+
+# Status register (0x0100) bits
+STATUS_BUSY = 0x0001
+STATUS_GRIP_DETECTED = 0x0002
+STATUS_ERR_NOT_CALIBRATED = 0x0008
+STATUS_ERR_LINEAR_SENSOR = 0x0010
+
+# Nominal external width range (mm) for known product codes - saves reading 259/260
+_LIMITS_BY_PRODUCT = {
+    0xC0: (13.0, 31.0),  # 2FG7
+    0xC1: (22.0, 48.0),  # 2FG14
+}
+_GRIPPER_NAMES = {
+    0xC0: "2FG7 (13-31mm)",
+    0xC1: "2FG14 (22-48mm)",
+}
 
 class SimpleGripperControl:
     """Direct TCP Modbus communication - No pymodbus dependency"""
@@ -13,113 +42,306 @@ class SimpleGripperControl:
         self.port = port
         self.unit_id = unit_id
         self.sock = None
-        self.transaction_id = 1
-        self.lock = threading.Lock()  # For thread safety
+        self.timeout = 3.0
+        self._tx_buf = bytearray(MODBUS_MAX_ADU)  # Reused for every outgoing frame
+        self._mbap_buf = bytearray(_MBAP.size)    # Header half of a sendmsg() gather-write
+        self._rx_buf = bytearray(MODBUS_MAX_ADU)  # Reused for every incoming frame
+        self._limits_cache = None        # (min_mm, max_mm) - fixed per gripper
+        self._product_code_cache = None
+        self.status_raw = 0              # Last status register value read
+        # Requests are pipelined: the writer thread sends queued frames back-to-back and
+        # the reader thread matches responses to callers by MBAP transaction ID
+        self._transaction_ids = itertools.count(1)
+        self._pending = {}               # transaction_id -> (function_code, Future)
+        self._req_q = collections.deque()  # append/popleft are atomic - no lock needed
+        self._req_ready = threading.Event()
+        self._running = False
+        self._writer_thread = None
+        self._reader_thread = None
         
     def connect(self):
         """Establish connection to Compute Box"""
         try:
-            with self.lock:
-                if self.sock:
-                    self.sock.close()
-                
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.settimeout(3.0)
-                self.sock.connect((self.ip, self.port))
-                print(f"✓ Connected to {self.ip}:{self.port}")
-                return True
+            self._stop_io_threads()
+            if self.sock:
+                self.sock.close()
+            self._limits_cache = None
+            self._product_code_cache = None
+            
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.settimeout(self.timeout)
+            # Every Modbus ADU is <= 260 bytes; small kernel buffers stop stale requests
+            # piling up behind a stalled Compute Box (set before connect so the window is sized)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2048)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            self.sock.connect((self.ip, self.port))
+            # After connecting, waits are done with select() against a per-request deadline
+            self.sock.setblocking(False)
+            # Modbus frames are tiny request/response pairs - don't let Nagle hold them back
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            self._enable_keepalive()
+            
+            self._running = True
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+            self._writer_thread.start()
+            self._reader_thread.start()
+            print(f"✓ Connected to {self.ip}:{self.port}")
+            
+            # Probe the product once; known grippers have fixed limits, unknown ones
+            # fall back to reading them from the gripper in get_limits()
+            self._limits_cache = _LIMITS_BY_PRODUCT.get(self.get_product_info())
+            return True
         except Exception as e:
             print(f"✗ Connection error: {e}")
             return False
     
+    def _enable_keepalive(self, idle=5, interval=2, count=3):
+        """Probe an idle link so a dead Compute Box is detected in ~idle + interval*count seconds"""
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Linux
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+        elif hasattr(socket, "SIO_KEEPALIVE_VALS"):  # Windows
+            self.sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+    
     def disconnect(self):
         """Close connection"""
-        with self.lock:
-            if self.sock:
-                self.sock.close()
-                self.sock = None
-                print("Disconnected")
+        self._stop_io_threads()
+        self._limits_cache = None
+        self._product_code_cache = None
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+            print("Disconnected")
+    
+    def _stop_io_threads(self):
+        """Stop the writer/reader threads and fail any requests still in flight"""
+        self._running = False
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._req_q.append(None)
+            self._req_ready.set()
+            self._writer_thread.join(timeout=1.0)
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)  # Wake the reader out of recv
+            except OSError:
+                pass
+        if self._reader_thread and self._reader_thread.is_alive():
+            self._reader_thread.join(timeout=1.0)
+        self._writer_thread = None
+        self._reader_thread = None
+        self._fail_pending()
+    
+    def _fail_pending(self):
+        """Resolve every outstanding request with None"""
+        while self._req_q:
+            req = self._req_q.popleft()
+            if req is not None:
+                self._pending.pop(req[0], None)
+        for transaction_id in list(self._pending):
+            entry = self._pending.pop(transaction_id, None)
+            if entry:
+                entry[1].set_result(None)
+    
+    def _writer_loop(self):
+        """Writer thread: the only sender on the socket, writes queued frames as they arrive"""
+        while True:
+            self._req_ready.wait()
+            self._req_ready.clear()
+            while self._req_q:
+                req = self._req_q.popleft()
+                if req is None:
+                    return
+                if len(req) == 2:
+                    self._write_frame(*req)
+                else:
+                    self._write_short_frame(*req)
     
-    def _send_modbus_request(self, function_code, data):
-        """Send raw Modbus TCP request and get response"""
-        if not self.sock:
-            return None
+    def _write_frame(self, transaction_id, data):
+        """Frame and send one request PDU (writer thread only)"""
+        try:
+            # Transaction ID (2), Protocol ID (2), Length (2), Unit ID (1)
+            length = len(data) + 1  # +1 for unit_id
+            frame_len = 7 + len(data)
+            sent = 0
+            
+            if _HAS_SENDMSG:
+                # Gather-write header and PDU straight from their own buffers
+                _MBAP.pack_into(self._mbap_buf, 0, transaction_id, 0, length, self.unit_id)
+                try:
+                    sent = self.sock.sendmsg([self._mbap_buf, data])
+                except BlockingIOError:
+                    sent = 0
+                if sent == frame_len:
+                    return
             
-        with self.lock:
+            # No sendmsg (Windows) or a partial gather-write: build the frame in the
+            # reusable buffer and send whatever is left
+            _MBAP.pack_into(self._tx_buf, 0,
+                            transaction_id, 
+                            0,           # Protocol ID = 0 for Modbus
+                            length, 
+                            self.unit_id)
+            self._tx_buf[7:frame_len] = data
+            self._send_all(memoryview(self._tx_buf)[sent:frame_len])
+        except Exception as e:
+            print(f"Communication error: {e}")
+            entry = self._pending.pop(transaction_id, None)
+            if entry:
+                entry[1].set_result(None)
+    
+    def _write_short_frame(self, transaction_id, function_code, address, value):
+        """Send a fixed-size FC 0x03/0x06 request, packing MBAP + PDU in a single call (writer thread only)"""
+        try:
+            _SHORT_FRAME.pack_into(self._tx_buf, 0,
+                                   transaction_id, 0, 6, self.unit_id,  # Length = unit_id + 5-byte PDU
+                                   function_code, address, value)
+            self._send_all(memoryview(self._tx_buf)[:_SHORT_FRAME.size])
+        except Exception as e:
+            print(f"Communication error: {e}")
+            entry = self._pending.pop(transaction_id, None)
+            if entry:
+                entry[1].set_result(None)
+    
+    def _reader_loop(self):
+        """Reader thread: the only receiver on the socket, dispatches responses by transaction ID"""
+        while self._running:
             try:
-                # Increment transaction ID
-                transaction_id = self.transaction_id
-                self.transaction_id = (self.transaction_id + 1) % 65536
-                
-                # Build MBAP header
-                # Transaction ID (2), Protocol ID (2), Length (2), Unit ID (1)
-                length = len(data) + 1  # +1 for unit_id
-                mbap_header = struct.pack('>HHHB', 
-                                         transaction_id, 
-                                         0,           # Protocol ID = 0 for Modbus
-                                         length, 
-                                         self.unit_id)
-                
-                # Build complete frame
-                frame = mbap_header + data
-                
-                # Send request
-                self.sock.sendall(frame)
+                # Wait briefly for the next response so a disconnect is noticed promptly
+                readable, _, _ = select.select([self.sock], [], [], 0.2)
+                if not readable:
+                    continue
+                # The whole frame must arrive within one timeout budget
+                deadline = time.monotonic() + self.timeout
                 
                 # Receive response header (7 bytes)
-                header = self.sock.recv(7)
-                if len(header) != 7:
-                    print(f"Invalid header length: {len(header)}")
-                    return None
+                self._recv_exact(0, 7, deadline)
                 
                 # Parse response header
-                resp_trans_id, resp_proto_id, resp_length, resp_unit_id = struct.unpack('>HHHB', header)
+                resp_trans_id, resp_proto_id, resp_length, resp_unit_id = _MBAP.unpack_from(self._rx_buf, 0)
                 
                 # Receive remaining data
-                data_len = resp_length - 1  # Subtract unit_id byte
-                if data_len > 0:
-                    response_data = self.sock.recv(data_len)
-                    if len(response_data) != data_len:
-                        print(f"Incomplete data: got {len(response_data)}, expected {data_len}")
-                        return None
-                else:
-                    response_data = b''
-                
-                # Check if it's an exception response
-                if response_data[0] == function_code + 0x80:
-                    print(f"Modbus exception: code {response_data[1]}")
-                    return None
-                
-                return response_data
-                
-            except socket.timeout:
-                print("Timeout sending/receiving data")
-                return None
+                frame_len = 7 + resp_length - 1  # Subtract unit_id byte (already in header)
+                if resp_length < 2 or frame_len > MODBUS_MAX_ADU:
+                    raise ValueError(f"Invalid response length: {resp_length}")
+                self._recv_exact(7, frame_len, deadline)
             except Exception as e:
-                print(f"Communication error: {e}")
-                return None
+                if self._running:
+                    print(f"Communication error: {e}")
+                break
+            
+            entry = self._pending.pop(resp_trans_id, None)
+            if entry is None:
+                continue  # Response to a request whose caller already gave up
+            function_code, future = entry
+            
+            # Check if it's an exception response
+            if self._rx_buf[7] == function_code + 0x80:
+                print(f"Modbus exception: code {self._rx_buf[8]}")
+                future.set_result(None)
+            else:
+                # Copy out of the shared buffer - the caller reads it on another thread
+                future.set_result(bytes(self._rx_buf[7:frame_len]))
+        
+        # Link is down (or being stopped): refuse new requests until connect() instead of
+        # queueing them to a socket nobody reads, then release everyone still waiting
+        self._running = False
+        self._fail_pending()
+    
+    def _submit_modbus_request(self, function_code, data, short_pdu=None):
+        """Queue a Modbus request without waiting; returns a Future resolving to the response PDU
+        
+        Passing short_pdu=(address, value) instead of data sends a 5-byte FC 0x03/0x06 PDU
+        that the writer packs together with the MBAP header in one struct call.
+        """
+        future = Future()
+        if not self.sock or not self._running:
+            future.set_result(None)
+            return future
+        
+        transaction_id = next(self._transaction_ids) & 0xFFFF
+        future.transaction_id = transaction_id  # Lets a caller that gives up drop its entry
+        self._pending[transaction_id] = (function_code, future)
+        if short_pdu is None:
+            self._req_q.append((transaction_id, data))
+        else:
+            self._req_q.append((transaction_id, function_code) + short_pdu)
+        self._req_ready.set()
+        return future
+    
+    def _send_modbus_request(self, function_code, data, short_pdu=None):
+        """Send raw Modbus TCP request and get response"""
+        future = self._submit_modbus_request(function_code, data, short_pdu)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            print("Timeout waiting for Modbus response")
+            self._pending.pop(future.transaction_id, None)
+            return None
+    
+    def _recv_exact(self, start, end, deadline):
+        """Fill self._rx_buf[start:end] from the socket before deadline, looping over partial TCP reads"""
+        view = memoryview(self._rx_buf)
+        while start < end:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout(f"Incomplete frame: got {start} of {end} bytes")
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                continue
+            try:
+                nread = self.sock.recv_into(view[start:end])
+            except BlockingIOError:
+                continue
+            if nread == 0:
+                raise ConnectionError("Connection closed by Compute Box")
+            start += nread
+    
+    def _send_all(self, view):
+        """sendall() for the non-blocking socket, bounded by the request timeout"""
+        deadline = time.monotonic() + self.timeout
+        while view:
+            try:
+                view = view[self.sock.send(view):]
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("Send buffer stayed full")
+                select.select([], [self.sock], [], remaining)
     
     def read_holding_register(self, address):
         """Read a single holding register (Function Code 0x03)"""
-        # Build PDU: Function Code (1), Address (2), Quantity (2)
-        pdu = struct.pack('>BHH', 0x03, address, 1)
-        
-        response = self._send_modbus_request(0x03, pdu)
+        # PDU: Function Code (1), Address (2), Quantity (2)
+        response = self._send_modbus_request(0x03, None, (address, 1))
         if response and len(response) >= 3:
             # Response format: FC (1), Byte Count (1), Data (2*N)
             if response[0] == 0x03 and response[1] == 2:
-                value = struct.unpack('>H', response[2:4])[0]
+                value = _U16.unpack_from(response, 2)[0]
                 return value
         
         print(f"Failed to read register {address}")
         return None
     
+    def read_holding_registers(self, address, count):
+        """Read a contiguous block of holding registers in one request (Function Code 0x03)"""
+        # PDU: Function Code (1), Address (2), Quantity (2)
+        response = self._send_modbus_request(0x03, None, (address, count))
+        if response and len(response) >= 2 + 2 * count:
+            # Response format: FC (1), Byte Count (1), Data (2*N)
+            if response[0] == 0x03 and response[1] == 2 * count:
+                return struct.unpack(f'>{count}H', response[2:2 + 2 * count])
+        
+        print(f"Failed to read registers {address}-{address + count - 1}")
+        return None
+    
     def write_single_register(self, address, value):
         """Write a single register (Function Code 0x06)"""
-        # Build PDU: Function Code (1), Address (2), Value (2)
-        pdu = struct.pack('>BHH', 0x06, address, value)
-        
-        response = self._send_modbus_request(0x06, pdu)
+        # PDU: Function Code (1), Address (2), Value (2)
+        response = self._send_modbus_request(0x06, None, (address, value))
         if response and len(response) >= 5:
             # Response should echo the request
             if response[0] == 0x06:
@@ -128,9 +350,26 @@ class SimpleGripperControl:
         print(f"Failed to write register {address}")
         return False
     
+    def write_multiple_registers(self, address, values):
+        """Write a block of contiguous registers in one request (Function Code 0x10)"""
+        count = len(values)
+        # PDU: Function Code (1), Address (2), Quantity (2), Byte Count (1), Values (2*N)
+        pdu = _PDU_WMR.pack(0x10, address, count, 2 * count) + struct.pack(f'>{count}H', *values)
+        
+        response = self._send_modbus_request(0x10, pdu)
+        if response and len(response) >= 5:
+            # Response echoes the start address and quantity
+            if response[0] == 0x10:
+                return True
+        
+        print(f"Failed to write registers {address}-{address + count - 1}")
+        return False
+    
     def get_product_info(self):
-        """Read product code to verify connection"""
-        return self.read_holding_register(1536)
+        """Read product code to verify connection (cached until reconnect)"""
+        if self._product_code_cache is None:
+            self._product_code_cache = self.read_holding_register(1536)
+        return self._product_code_cache
     
     def get_current_width(self):
         """Get current external width in mm"""
@@ -140,39 +379,65 @@ class SimpleGripperControl:
         return None
     
     def get_limits(self):
-        """Get min and max width in mm"""
-        min_val = self.read_holding_register(259)  # 0x0103 Min external width
-        max_val = self.read_holding_register(260)  # 0x0104 Max external width
+        """Get min and max width in mm (cached until reconnect, they are fixed per gripper)"""
+        if self._limits_cache is not None:
+            return self._limits_cache
         
-        if min_val is not None and max_val is not None:
-            return min_val/10.0, max_val/10.0  # Convert to mm
+        regs = self.read_holding_registers(259, 2)  # 0x0103 Min / 0x0104 Max external width
+        
+        if regs is not None:
+            min_val, max_val = regs
+            self._limits_cache = (min_val/10.0, max_val/10.0)  # Convert to mm
+            return self._limits_cache
         return None, None
     
+    def get_status_raw(self):
+        """Read the raw status register; the flag properties below decode the last value read"""
+        value = self.read_holding_register(256)  # 0x0100 Status
+        if value is not None:
+            self.status_raw = value
+        return value
+    
     def get_status(self):
         """Get gripper status"""
-        value = self.read_holding_register(256)  # 0x0100 Status
+        value = self.get_status_raw()
         if value is not None:
-            return {
-                'busy': bool(value & 0x0001),
-                'grip_detected': bool(value & 0x0002),
-                'error_not_calibrated': bool(value & 0x0008),
-                'error_linear_sensor': bool(value & 0x0010)
-            }
+            return self.decode_status(value)
         return None
     
+    @property
+    def busy(self):
+        return bool(self.status_raw & STATUS_BUSY)
+    
+    @property
+    def grip_detected(self):
+        return bool(self.status_raw & STATUS_GRIP_DETECTED)
+    
+    @property
+    def err_not_calibrated(self):
+        return bool(self.status_raw & STATUS_ERR_NOT_CALIBRATED)
+    
+    @property
+    def err_linear_sensor(self):
+        return bool(self.status_raw & STATUS_ERR_LINEAR_SENSOR)
+    
+    @staticmethod
+    def decode_status(value):
+        """Decode the 0x0100 status register into named flags"""
+        return {
+            'busy': bool(value & STATUS_BUSY),
+            'grip_detected': bool(value & STATUS_GRIP_DETECTED),
+            'error_not_calibrated': bool(value & STATUS_ERR_NOT_CALIBRATED),
+            'error_linear_sensor': bool(value & STATUS_ERR_LINEAR_SENSOR)
+        }
+    
     def set_gripper_parameters(self, width_mm, force_n=20, speed_percent=50):
         """Set gripper parameters"""
         # Convert width to 1/10 mm
         width_units = int(width_mm * 10)
         
-        # Set parameters with error checking
-        success = True
-        if not self.write_single_register(0, width_units):    # Target width
-            success = False
-        if not self.write_single_register(1, force_n):        # Target force
-            success = False
-        if not self.write_single_register(2, speed_percent):  # Target speed
-            success = False
+        # Target width (0), force (1) and speed (2) are contiguous - write them in one request
+        success = self.write_multiple_registers(0, [width_units, force_n, speed_percent])
         
         if success:
             print(f"✓ Set: Width={width_mm}mm, Force={force_n}N, Speed={speed_percent}%")
@@ -185,6 +450,17 @@ class SimpleGripperControl:
         """Execute gripper command (1=grip external, 2=grip internal, 3=stop)"""
         return self.write_single_register(3, command)
     
+    def wait_ready(self, timeout=0.5, poll_interval=0.005):
+        """Poll the busy bit until the gripper is ready, bounded by timeout. Returns True if ready."""
+        deadline = time.monotonic() + timeout
+        while True:
+            value = self.get_status_raw()
+            if value is not None and not value & STATUS_BUSY:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+    
     def full_open(self, force_n=20, speed_percent=50):
         """Open gripper to maximum width"""
         min_width, max_width = self.get_limits()
@@ -196,7 +472,7 @@ class SimpleGripperControl:
         
         # Set parameters
         if self.set_gripper_parameters(max_width, force_n, speed_percent):
-            time.sleep(0.1)  # Small delay
+            self.wait_ready()
             if self.execute_command(1):  # Grip external command
                 print(f"✓ Opening to {max_width}mm")
                 return True
@@ -215,7 +491,7 @@ class SimpleGripperControl:
         
         # Set parameters
         if self.set_gripper_parameters(min_width, force_n, speed_percent):
-            time.sleep(0.1)  # Small delay
+            self.wait_ready()
             if self.execute_command(1):  # Grip external command
                 print(f"✓ Closing to {min_width}mm")
                 return True
@@ -241,7 +517,14 @@ class GripperGUI:
         self.root.configure(bg='#f0f0f0')
         
         self.setup_ui()
-        self.update_status()
+        
+        # Status polling runs in a worker thread so slow Modbus replies can't freeze the GUI
+        self._status_q = queue.Queue(maxsize=1)
+        self._status_fields = None  # Last text written to each status slot; None until painted
+        self._last_status_raw = None
+        self._running = True
+        threading.Thread(target=self._poll_status, daemon=True).start()
+        self._drain_status()
     
     def setup_ui(self):
         # Title
@@ -347,10 +630,9 @@ class GripperGUI:
                 self.log_message(f"✓ Connected! Product code: {product_code} (0x{product_code:04X})")
                 
                 # Identify gripper type
-                if product_code == 0xC0:
-                    self.log_message("Gripper: 2FG7 (13-31mm)")
-                elif product_code == 0xC1:
-                    self.log_message("Gripper: 2FG14 (22-48mm)")
+                name = _GRIPPER_NAMES.get(product_code)
+                if name:
+                    self.log_message(f"Gripper: {name}")
                 else:
                     self.log_message(f"Unknown gripper type: {product_code}")
             else:
@@ -408,42 +690,94 @@ class GripperGUI:
         else:
             self.log_message("✗ Failed to stop gripper")
     
-    def update_status(self):
-        """Update status information periodically"""
-        if hasattr(self, 'gripper') and hasattr(self.gripper, 'sock') and self.gripper.sock:
-            try:
-                # Read current width
-                width = self.gripper.get_current_width()
-                if width is not None:
-                    # Clear info text and show current status
-                    self.info_text.delete(1.0, tk.END)
-                    self.info_text.insert(tk.END, f"Current Width: {width:.1f} mm\n\n")
-                    
-                    # Get limits
-                    min_width, max_width = self.gripper.get_limits()
-                    if min_width is not None and max_width is not None:
-                        self.info_text.insert(tk.END, f"Min Width: {min_width:.1f} mm\n")
-                        self.info_text.insert(tk.END, f"Max Width: {max_width:.1f} mm\n\n")
-                    
-                    # Get status
-                    status = self.gripper.get_status()
-                    if status:
-                        self.info_text.insert(tk.END, "Status:\n")
-                        self.info_text.insert(tk.END, f"  Busy: {'Yes' if status['busy'] else 'No'}\n")
-                        self.info_text.insert(tk.END, f"  Grip Detected: {'Yes' if status['grip_detected'] else 'No'}\n")
+    def _poll_status(self):
+        """Background thread: read gripper status off the Tk thread and hand snapshots to the GUI"""
+        while self._running:
+            if self.gripper.sock:
+                try:
+                    # One FC 0x03 read covers status (256) and width (257);
+                    # the limits are only read from the gripper on the first poll
+                    regs = self.gripper.read_holding_registers(256, 2)
+                    if regs is not None:
+                        status_raw, width_raw = regs
+                        snapshot = (width_raw / 10.0, self.gripper.get_limits(), status_raw)
                         
-                        if status['error_not_calibrated']:
-                            self.info_text.insert(tk.END, "  ⚠ ERROR: Not calibrated\n")
-                        if status['error_linear_sensor']:
-                            self.info_text.insert(tk.END, "  ⚠ ERROR: Linear sensor\n")
-            except Exception as e:
-                print(f"Error updating status: {e}")
+                        # Keep only the newest snapshot
+                        try:
+                            self._status_q.get_nowait()
+                        except queue.Empty:
+                            pass
+                        self._status_q.put_nowait(snapshot)
+                except Exception as e:
+                    print(f"Error updating status: {e}")
+            time.sleep(1.0)
+    
+    # Static layout of the status block: (label, field, suffix). Field values live
+    # between a pair of text marks so each poll only rewrites what changed.
+    _STATUS_LAYOUT = (
+        ("Current Width: ", "width", " mm\n\n"),
+        ("Min Width: ", "min_width", " mm\n"),
+        ("Max Width: ", "max_width", " mm\n\n"),
+        ("Status:\n  Busy: ", "busy", "\n"),
+        ("  Grip Detected: ", "grip", "\n"),
+        ("", "errors", "\n"),
+    )
+    
+    def _paint_status_layout(self):
+        """Write the fixed status labels once and place marks around each value slot"""
+        self.info_text.delete(1.0, tk.END)
+        for label, field, suffix in self._STATUS_LAYOUT:
+            self.info_text.insert(tk.END, label)
+            slot = self.info_text.index("end-1c")
+            self.info_text.insert(tk.END, suffix)
+            self.info_text.mark_set(f"{field}_start", slot)
+            self.info_text.mark_gravity(f"{field}_start", tk.LEFT)
+            self.info_text.mark_set(f"{field}_end", slot)
+            self.info_text.mark_gravity(f"{field}_end", tk.RIGHT)
+        self._status_fields = {}
+        self._last_status_raw = None
+    
+    def _set_status_field(self, field, text):
+        """Replace one value slot in the status block if its text changed"""
+        if self._status_fields.get(field) == text:
+            return
+        self.info_text.delete(f"{field}_start", f"{field}_end")
+        self.info_text.insert(f"{field}_start", text)
+        self._status_fields[field] = text
+    
+    def _drain_status(self):
+        """Render the latest status snapshot (runs on the Tk thread, never blocks)"""
+        try:
+            width, (min_width, max_width), status_raw = self._status_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            if self._status_fields is None:
+                self._paint_status_layout()
+            
+            self._set_status_field("width", f"{width:.1f}")
+            self._set_status_field("min_width", f"{min_width:.1f}" if min_width is not None else "--")
+            self._set_status_field("max_width", f"{max_width:.1f}" if max_width is not None else "--")
+            
+            # Status flags only need decoding when the register changed
+            if status_raw != self._last_status_raw:
+                self._last_status_raw = status_raw
+                self._set_status_field("busy", 'Yes' if status_raw & STATUS_BUSY else 'No')
+                self._set_status_field("grip", 'Yes' if status_raw & STATUS_GRIP_DETECTED else 'No')
+                
+                errors = ""
+                if status_raw & STATUS_ERR_NOT_CALIBRATED:
+                    errors += "  ⚠ ERROR: Not calibrated\n"
+                if status_raw & STATUS_ERR_LINEAR_SENSOR:
+                    errors += "  ⚠ ERROR: Linear sensor\n"
+                self._set_status_field("errors", errors)
         
-        # Schedule next update
-        self.root.after(1000, self.update_status)
+        # Schedule next check
+        self.root.after(100, self._drain_status)
     
     def on_closing(self):
         """Handle window closing"""
+        self._running = False
         self.gripper.disconnect()
         self.root.destroy()
     
@@ -470,10 +804,7 @@ def command_line_test():
     product_code = gripper.get_product_info()
     if product_code:
         print(f"✓ Product code: {product_code} (0x{product_code:04X})")
-        if product_code == 0xC0:
-            print("Gripper: 2FG7")
-        elif product_code == 0xC1:
-            print("Gripper: 2FG14")
+        print(f"Gripper: {_GRIPPER_NAMES.get(product_code, f'Unknown (0x{product_code:04X})')}")
     else:
         print("✗ Could not read product code")
     
@@ -4,13 +4,166 @@ Advanced WebSocket bridge with proper OnRobot 2FG7 gripper control
 Now with adjustable width settings and proper protocol compliance
 """
 import asyncio
+import logging
 import websockets
 import socket
 import json
 import time
 import struct
 import threading
-from typing import Optional, Dict, Any, Tuple
+import queue
+import selectors
+import functools
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+log = logging.getLogger("gripper")
+ws_log = logging.getLogger("wsbridge")
+
+# pysimdjson parses inbound frames lazily: only the fields a handler touches become
+# Python objects. Optional, like orjson below.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+def _json_default(obj):
+    """Serialize lazy simdjson values that end up in a reply (e.g. an echoed pose)"""
+    if simdjson is not None:
+        if isinstance(obj, simdjson.Object):
+            return obj.as_dict()
+        if isinstance(obj, simdjson.Array):
+            return obj.as_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# orjson parses/serializes several times faster than the stdlib; it stays optional.
+# Replies are decoded back to str so they still go out as text frames, which the
+# browser client JSON.parse()s directly.
+try:
+    import orjson
+    
+    # Bound once so the per-reply path skips the module attribute lookups
+    _orjson_dumps = orjson.dumps
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY
+    
+    def _json_dumps(obj) -> str:
+        return _orjson_dumps(obj, default=_json_default, option=_ORJSON_OPTS).decode()
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, default=_json_default)
+    
+    _json_loads = json.loads
+
+def _json_scalar(value) -> str:
+    """JSON text for a reply template slot; plain ints/finite floats skip the serializer"""
+    if value is None:
+        return "null"
+    if type(value) is int or (type(value) is float and value == value and abs(value) != float("inf")):
+        return repr(value)
+    return _json_dumps(value)
+
+
+# Modbus TCP framing (pre-compiled struct formats)
+_MBAP = struct.Struct('>HHHB')       # Transaction ID, Protocol ID, Length, Unit ID
+_READ_PDU = struct.Struct('>BHH')    # FC 0x03: Function Code, Address, Quantity
+_WRITE_PDU = struct.Struct('>BHH')   # FC 0x06: Function Code, Address, Value
+_WRITE_MULTI_PDU = struct.Struct('>BHHB')  # FC 0x10: Function Code, Address, Quantity, Byte Count
+_ADDR_QTY = struct.Struct('>HH')     # FC 0x10 response: Address, Quantity
+_REG_RESP = struct.Struct('>H')
+_UR_PACKET_SIZE = struct.Struct('>I')  # Real-time interface (port 30003): 4-byte message size
+_UR_JOINT_SPEEDS = struct.Struct('>6d')  # qd actual (rad/s)
+_UR_DOUBLE = struct.Struct('>d')
+MODBUS_MAX_ADU = 260                 # Max Modbus TCP frame size (7-byte MBAP + 253-byte PDU)
+
+
+# ===================================================================
+# Socket tuning shared by the gripper and arm connections
+# ===================================================================
+SOCKET_BUFFER_SIZE = 1 << 20  # Requested size; the kernel caps it at net.core.rmem_max / wmem_max
+
+
+def _tune_socket(sock: socket.socket):
+    """Disable Nagle and size the kernel buffers (call before connect)"""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+
+
+def _set_quickack(sock: socket.socket):
+    """Suppress delayed ACKs on Linux (call after connect)"""
+    if hasattr(socket, "TCP_QUICKACK"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
+def _enable_keepalive(sock: socket.socket, idle=5, interval=2, count=3):
+    """Probe an idle link so a dead peer is detected in ~idle + interval*count seconds"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):  # Linux
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+    elif hasattr(socket, "SIO_KEEPALIVE_VALS"):  # Windows
+        sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+
+
+class SocketReactor:
+    """One thread that waits for read readiness on several sockets and dispatches callbacks.
+    
+    RobotSystem shares a single reactor between the gripper and the arm so both reply
+    streams are drained by the same thread. Callbacks run on the reactor thread and must
+    not block: each one does a single recv_into and parses whatever complete frames it has.
+    """
+    
+    SELECT_TIMEOUT = 0.2
+    
+    def __init__(self):
+        self._sel = selectors.DefaultSelector()
+        self._has_sockets = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def register(self, sock: socket.socket, callback):
+        """Call callback() on the reactor thread whenever sock is readable.
+        
+        Bind the socket into the callback (functools.partial) rather than having it read
+        an attribute: a callback dispatched just after a reconnect must not read the new socket.
+        """
+        self._sel.register(sock, selectors.EVENT_READ, callback)
+        self._has_sockets.set()
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+    
+    def unregister(self, sock: socket.socket):
+        """Stop watching sock (call before closing it)"""
+        try:
+            self._sel.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        if not self._sel.get_map():
+            self._has_sockets.clear()
+    
+    def _run(self):
+        while True:
+            # select() with nothing registered is an error on Windows
+            if not self._has_sockets.wait(self.SELECT_TIMEOUT):
+                continue
+            try:
+                events = self._sel.select(timeout=self.SELECT_TIMEOUT)
+            except (OSError, ValueError):
+                continue  # A socket was closed between register and select
+            for key, _ in events:
+                try:
+                    key.data()
+                except Exception as e:
+                    print(f"⚠️  Reactor callback error: {e}")
+
 
 # ===================================================================
 # OnRobot 2FG7 Gripper Controller (Modbus TCP) - UPDATED
@@ -18,64 +171,98 @@ from typing import Optional, Dict, Any, Tuple
 class OnRobotGripper:
     """Direct TCP Modbus communication for OnRobot 2FG7/2FG14 gripper"""
     
-    def __init__(self, ip="192.168.1.1", port=502, unit_id=65):
+    STATUS_POLL_INTERVAL = 0.05  # seconds between background status reads
+    TIMEOUT = 3.0                # seconds to wait for a Modbus response
+    RECONNECT_ATTEMPTS = 3       # with exponential backoff starting at RECONNECT_BACKOFF
+    RECONNECT_BACKOFF = 0.1
+    LINK_RETRY_MIN = 1.0         # poller's wait between reconnect rounds while the link is down,
+    LINK_RETRY_MAX = 30.0        # doubling up to this
+    
+    def __init__(self, ip="192.168.1.1", port=502, unit_id=65, reactor: Optional[SocketReactor] = None):
         self.ip = ip
         self.port = port
         self.unit_id = unit_id
         self.sock = None
         self.transaction_id = 1
-        self.lock = threading.Lock()
+        # Guards the socket lifecycle: connect(), disconnect() and _reconnect(). Re-entrant
+        # because a request made inside connect() can fail and call _reconnect(). Nothing on
+        # the request path takes it - the writer thread alone sends on the socket.
+        self.lock = threading.RLock()
+        # Callers queue (function_code, pdu, Future); the writer thread sends them back-to-back
+        # and the reactor completes them by MBAP transaction ID, so several can be in flight
+        self._tx_queue: "queue.Queue[Optional[Tuple[int, bytes, Future]]]" = queue.Queue()
+        self._pending: Dict[int, Tuple[int, Future]] = {}  # transaction_id -> (function_code, future)
+        # Guards _pending between the writer, the reactor and _fail_pending (never re-entered)
+        self._pending_lock = threading.Lock()
+        self._io_stop = threading.Event()
+        self._link_down = False  # Set by the I/O threads on a socket error; cleared by _reconnect()
+        self._writer_thread = None
+        self._reactor = reactor or SocketReactor()
+        self._registered_sock = None
         self.connected = False
         self.product_code = None
         self.model_type = None
         self.model_limits = None  # Will store (min_width_mm, max_width_mm)
         self.is_2fg7 = False
         self.is_2fg14 = False
+        # Hardware constants (0x0103-0x0106, in 1/10 mm), read once in connect()
+        self._min_ext = None
+        self._max_ext = None
+        self._min_int = None
+        self._max_int = None
+        self._send_buf = bytearray(MODBUS_MAX_ADU)  # Reused for every outgoing frame
+        self._recv_buf = bytearray(MODBUS_MAX_ADU)  # Reused for every incoming frame (reactor thread)
+        self._rx_len = 0  # Bytes of a partial frame currently held in _recv_buf
+        # Status is polled in the background; get_status() returns the latest snapshot.
+        # No lock: each snapshot is a fresh dict that is never mutated once published,
+        # and swapping the reference is atomic.
+        self._status_cache: Dict[str, Any] = {}
+        self.status_version = 0  # Bumped only when a poll returns something different
+        self._poller_stop = threading.Event()
+        self._poller_thread = None
         
     def connect(self) -> bool:
         """Establish connection to Compute Box"""
-        print(f"[GRIPPER] Connecting to {self.ip}:{self.port}...")
+        log.info("[GRIPPER] Connecting to %s:%s...", self.ip, self.port)
         
         try:
             with self.lock:
-                if self.sock:
-                    self.sock.close()
-                
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.settimeout(3.0)
-                self.sock.connect((self.ip, self.port))
-                self.connected = True
+                self._stop_status_poller()
+                self._open_socket()
                 
                 # Read product code to identify the gripper
                 self.product_code = self._read_holding_register(1536)
                 if self.product_code:
-                    print(f"[GRIPPER] ✓ Connected! Product code: 0x{self.product_code:04X}")
+                    log.info("[GRIPPER] ✓ Connected! Product code: 0x%04X", self.product_code)
                     
                     # Set model information based on product code
                     if self.product_code == 0xC0:  # 2FG7
                         self.model_type = "2FG7"
                         self.is_2fg7 = True
-                        print(f"[GRIPPER] Type: 2FG7 (13-31mm)")
+                        log.info("[GRIPPER] Type: 2FG7 (13-31mm)")
                     elif self.product_code == 0xC1:  # 2FG14
                         self.model_type = "2FG14"
                         self.is_2fg14 = True
-                        print(f"[GRIPPER] Type: 2FG14 (22-48mm)")
+                        log.info("[GRIPPER] Type: 2FG14 (22-48mm)")
                     elif self.product_code == 0xF0:  # 2FGP20
                         self.model_type = "2FGP20"
-                        print(f"[GRIPPER] Type: 2FGP20")
+                        log.info("[GRIPPER] Type: 2FGP20")
                     else:
                         self.model_type = "Unknown"
-                        print(f"[GRIPPER] Type: Unknown (0x{self.product_code:04X})")
+                        log.info("[GRIPPER] Type: Unknown (0x%04X)", self.product_code)
                     
-                    # Read actual hardware limits from the gripper
-                    min_width_units = self._read_holding_register(259)  # Min external width
-                    max_width_units = self._read_holding_register(260)  # Max external width
+                    # Read actual hardware limits from the gripper (0x0103 Min / 0x0104 Max external
+                    # width, 0x0105 Min / 0x0106 Max internal width) - these never change, so they
+                    # are cached here instead of being polled
+                    limit_regs = self._read_holding_registers(259, 4)
                     
-                    if min_width_units is not None and max_width_units is not None:
+                    if limit_regs is not None:
+                        self._min_ext, self._max_ext, self._min_int, self._max_int = limit_regs
+                        min_width_units, max_width_units = self._min_ext, self._max_ext
                         min_width_mm = min_width_units / 10.0
                         max_width_mm = max_width_units / 10.0
                         self.model_limits = (min_width_mm, max_width_mm)
-                        print(f"[GRIPPER] Actual limits: {min_width_mm}mm to {max_width_mm}mm")
+                        log.info("[GRIPPER] Actual limits: %smm to %smm", min_width_mm, max_width_mm)
                     else:
                         # Fallback to nominal limits based on model
                         if self.is_2fg7:
@@ -84,124 +271,361 @@ class OnRobotGripper:
                             self.model_limits = (22.0, 48.0)
                         else:
                             self.model_limits = (0.0, 100.0)
-                        print(f"[GRIPPER] Using nominal limits: {self.model_limits[0]}mm to {self.model_limits[1]}mm")
+                        log.info("[GRIPPER] Using nominal limits: %smm to %smm", *self.model_limits)
                         
                 else:
-                    print(f"[GRIPPER] ✓ Connected but could not read product code")
+                    log.warning("[GRIPPER] ✓ Connected but could not read product code")
                 
+                self._start_status_poller()
                 return True
                 
         except Exception as e:
-            print(f"[GRIPPER] ✗ Connection failed: {e}")
+            log.error("[GRIPPER] ✗ Connection failed: %s", e)
             self.connected = False
             return False
     
+    def _open_socket(self):
+        """(Re)open the Modbus socket and start the I/O threads (caller holds self.lock)"""
+        self._stop_io_threads()
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.settimeout(self.TIMEOUT)
+        _tune_socket(self.sock)
+        self.sock.connect((self.ip, self.port))
+        _set_quickack(self.sock)
+        _enable_keepalive(self.sock)
+        self.connected = True
+        self._link_down = False
+        self._start_io_threads()
+    
+    def _reconnect(self) -> bool:
+        """Re-open the socket after a link failure, keeping the cached product code and limits"""
+        with self.lock:
+            if not self.connected:
+                return False
+            if not self._link_down:
+                return True  # Another thread already reconnected
+            
+            delay = self.RECONNECT_BACKOFF
+            for attempt in range(1, self.RECONNECT_ATTEMPTS + 1):
+                try:
+                    self._open_socket()
+                    log.info("[GRIPPER] Reconnected (attempt %d)", attempt)
+                    return True
+                except OSError as e:
+                    log.warning("[GRIPPER] Reconnect attempt %d failed: %s", attempt, e)
+                    time.sleep(delay)
+                    delay *= 2
+            
+            log.error("[GRIPPER] Giving up after %d reconnect attempts", self.RECONNECT_ATTEMPTS)
+            return False
+    
     def disconnect(self):
         """Close connection"""
+        self._stop_status_poller()
         with self.lock:
+            self._stop_io_threads()
             if self.sock:
                 self.sock.close()
                 self.sock = None
             self.connected = False
-            print("[GRIPPER] Disconnected")
+            log.info("[GRIPPER] Disconnected")
     
-    def _send_modbus_request(self, function_code: int, data: bytes) -> Optional[bytes]:
-        """Send raw Modbus TCP request and get response"""
-        if not self.connected or not self.sock:
-            return None
+    def _start_io_threads(self):
+        """Start the writer thread and hand the socket's reads to the reactor"""
+        self._io_stop.clear()
+        self._rx_len = 0
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        self._registered_sock = self.sock
+        self._reactor.register(self.sock, functools.partial(self._on_readable, self.sock))
+    
+    def _stop_io_threads(self):
+        """Stop the writer, detach from the reactor and fail whatever is still in flight"""
+        self._io_stop.set()
+        if self._registered_sock is not None:
+            self._reactor.unregister(self._registered_sock)
+            self._registered_sock = None
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._tx_queue.put(None)
+            self._writer_thread.join(timeout=1.0)
+        self._writer_thread = None
+        
+        # Fail anything still queued or awaiting a response
+        while True:
+            try:
+                request = self._tx_queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[2].set_result(None)
+        self._fail_pending()
+    
+    def _fail_pending(self):
+        """Resolve every in-flight request with None"""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for _, future in pending:
+            if not future.done():
+                future.set_result(None)
+    
+    def _writer_loop(self):
+        """Writer thread: assigns transaction IDs and sends queued requests back-to-back"""
+        while True:
+            request = self._tx_queue.get()
+            if request is None:
+                break
+            function_code, data, future = request
+            if future.done():
+                continue  # Timed out (cancelled) while still queued
             
-        try:
             # Increment transaction ID
             transaction_id = self.transaction_id
             self.transaction_id = (self.transaction_id + 1) % 65536
             
-            # Build MBAP header (Modbus Application Protocol)
+            # Build MBAP header (Modbus Application Protocol) + PDU in the reusable frame buffer
             length = len(data) + 1  # +1 for unit_id
-            mbap_header = struct.pack('>HHHB', 
-                                     transaction_id, 
-                                     0,           # Protocol ID = 0 for Modbus
-                                     length, 
-                                     self.unit_id)
-            
-            # Build complete frame
-            frame = mbap_header + data
+            frame_len = 7 + len(data)
+            _MBAP.pack_into(self._send_buf, 0,
+                            transaction_id, 
+                            0,           # Protocol ID = 0 for Modbus
+                            length, 
+                            self.unit_id)
+            self._send_buf[7:frame_len] = data
             
-            # Send request
-            self.sock.sendall(frame)
-            
-            # Receive response header (7 bytes)
-            header = self.sock.recv(7)
-            if len(header) != 7:
-                print(f"[GRIPPER] Invalid header length: {len(header)}")
-                return None
+            # Register before sending so the reader can never see an unknown ID; the
+            # waiter needs the ID too, to drop just this entry if it times out
+            future.transaction_id = transaction_id
+            with self._pending_lock:
+                self._pending[transaction_id] = (function_code, future)
             
+            try:
+                self.sock.sendall(memoryview(self._send_buf)[:frame_len])
+            except socket.timeout:
+                log.warning("[GRIPPER] Timeout sending data")
+                self._resolve(transaction_id, None)
+            except OSError as e:
+                log.error("[GRIPPER] Communication error: %s", e)
+                self._link_down = True
+                self._resolve(transaction_id, None)
+    
+    def _on_readable(self, sock: socket.socket):
+        """Reactor callback: take what the socket has and complete every whole frame in it"""
+        if sock is not self.sock:
+            return  # Already replaced by a reconnect; its reads are stale
+        try:
+            nread = sock.recv_into(memoryview(self._recv_buf)[self._rx_len:])
+        except (BlockingIOError, InterruptedError, socket.timeout):
+            return
+        except OSError as e:
+            self._on_link_error(e)
+            return
+        if not nread:
+            self._on_link_error(ConnectionError("Connection closed by Compute Box"))
+            return
+        self._rx_len += nread
+        
+        while self._rx_len >= 7:
             # Parse response header
-            resp_trans_id, resp_proto_id, resp_length, resp_unit_id = struct.unpack('>HHHB', header)
+            resp_trans_id, resp_proto_id, resp_length, resp_unit_id = _MBAP.unpack_from(self._recv_buf, 0)
+            frame_len = 6 + resp_length  # MBAP length counts the unit_id byte onward
+            if resp_length < 1 or frame_len > MODBUS_MAX_ADU:
+                self._on_link_error(ValueError(f"Invalid response length: {resp_length}"))
+                return
+            if self._rx_len < frame_len:
+                break  # Rest of the frame is still on the wire
             
-            # Receive remaining data
-            data_len = resp_length - 1  # Subtract unit_id byte
-            if data_len > 0:
-                response_data = self.sock.recv(data_len)
-                if len(response_data) != data_len:
-                    print(f"[GRIPPER] Incomplete data: got {len(response_data)}, expected {data_len}")
-                    return None
-            else:
-                response_data = b''
+            # Copied out: the response crosses to the waiting thread while the buffer is reused
+            response_data = bytes(self._recv_buf[7:frame_len])
+            remaining = self._rx_len - frame_len
+            if remaining:
+                self._recv_buf[:remaining] = self._recv_buf[frame_len:self._rx_len]
+            self._rx_len = remaining
+            
+            with self._pending_lock:
+                entry = self._pending.get(resp_trans_id)
+            if entry is None:
+                log.warning("[GRIPPER] Unexpected transaction ID %d", resp_trans_id)
+                continue
             
             # Check if it's an exception response
+            function_code = entry[0]
             if response_data and response_data[0] == function_code + 0x80:
                 exception_code = response_data[1]
-                print(f"[GRIPPER] Modbus exception: code {exception_code}")
-                return None
-            
-            return response_data
+                log.warning("[GRIPPER] Modbus exception: code %d", exception_code)
+                response_data = None
             
-        except socket.timeout:
-            print("[GRIPPER] Timeout sending/receiving data")
-            return None
-        except Exception as e:
-            print(f"[GRIPPER] Communication error: {e}")
+            self._resolve(resp_trans_id, response_data)
+    
+    def _on_link_error(self, error: Exception):
+        """The socket is unusable: stop reading it and fail everything in flight"""
+        if self._registered_sock is not None:
+            self._reactor.unregister(self._registered_sock)
+            self._registered_sock = None
+        if not self._io_stop.is_set():
+            log.error("[GRIPPER] Communication error: %s", error)
+            self._link_down = True
+        self._fail_pending()
+    
+    def _resolve(self, transaction_id: int, response: Optional[bytes]):
+        """Complete the in-flight request with this transaction ID"""
+        with self._pending_lock:
+            entry = self._pending.pop(transaction_id, None)
+        if entry is not None and not entry[1].done():
+            entry[1].set_result(response)
+    
+    def _submit_modbus_request(self, function_code: int, data: bytes) -> Future:
+        """Queue a Modbus request without waiting; the Future resolves to the response PDU"""
+        future: Future = Future()
+        if not self.connected or not self._writer_thread or self._link_down:
+            future.set_result(None)
+        else:
+            self._tx_queue.put((function_code, data, future))
+        return future
+    
+    def _wait_response(self, future: Future) -> Optional[bytes]:
+        """Block until a submitted request completes (None on error or timeout)"""
+        try:
+            return future.result(timeout=self.TIMEOUT)
+        except FutureTimeout:
+            log.warning("[GRIPPER] Timeout waiting for response")
+            # Drop only this request; others in flight keep their own deadlines
+            transaction_id = getattr(future, "transaction_id", None)
+            if transaction_id is None:
+                future.cancel()  # Never sent: the writer skips it
+            else:
+                self._resolve(transaction_id, None)
+            # A box that stays silent this long is treated as gone, so the retry reconnects
+            self._link_down = True
             return None
     
+    def _send_modbus_request(self, function_code: int, data: bytes) -> Optional[bytes]:
+        """Send raw Modbus TCP request and get response (re-issued once after a reconnect)"""
+        response = self._wait_response(self._submit_modbus_request(function_code, data))
+        if response is None and self._link_down and self._reconnect():
+            response = self._wait_response(self._submit_modbus_request(function_code, data))
+        return response
+    
     def _read_holding_register(self, address: int) -> Optional[int]:
         """Read a single holding register (Function Code 0x03)"""
-        pdu = struct.pack('>BHH', 0x03, address, 1)
-        response = self._send_modbus_request(0x03, pdu)
-        
-        if response and len(response) >= 3:
-            if response[0] == 0x03 and response[1] == 2:
-                return struct.unpack('>H', response[2:4])[0]
-        
+        response = self._send_modbus_request(0x03, _READ_PDU.pack(0x03, address, 1))
+        # Exceptions already came back as None; a good reply is exactly FC, byte count 2, value
+        if response is not None and len(response) == 4 and response[:2] == b'\x03\x02':
+            return _REG_RESP.unpack_from(response, 2)[0]
+        return None
+    
+    def _read_holding_registers(self, address: int, count: int) -> Optional[Tuple[int, ...]]:
+        """Read a contiguous block of holding registers in one request (Function Code 0x03)"""
+        pdu = _READ_PDU.pack(0x03, address, count)
+        return self._parse_registers(self._send_modbus_request(0x03, pdu), count)
+    
+    @staticmethod
+    def _parse_registers(response: Optional[bytes], count: int) -> Optional[Tuple[int, ...]]:
+        """Unpack the register values from a Function Code 0x03 response"""
+        if response is not None and len(response) == 2 + 2 * count and response[:2] == bytes((0x03, 2 * count)):
+            return struct.unpack_from(f'>{count}H', response, 2)
         return None
     
     def _write_single_register(self, address: int, value: int) -> bool:
         """Write a single register (Function Code 0x06)"""
-        pdu = struct.pack('>BHH', 0x06, address, value)
-        response = self._send_modbus_request(0x06, pdu)
+        pdu = _WRITE_PDU.pack(0x06, address, value)
+        # A successful FC 0x06 reply echoes the request PDU byte for byte
+        return self._send_modbus_request(0x06, pdu) == pdu
+    
+    def _write_multiple_registers(self, address: int, values: List[int]) -> bool:
+        """Write a block of contiguous registers in one request (Function Code 0x10)"""
+        count = len(values)
+        pdu = _WRITE_MULTI_PDU.pack(0x10, address, count, 2 * count) + struct.pack(f'>{count}H', *values)
+        response = self._send_modbus_request(0x10, pdu)
         
+        # Response echoes function code, start address and quantity
         if response and len(response) >= 5:
-            return response[0] == 0x06
+            return response[0] == 0x10 and _ADDR_QTY.unpack_from(response, 1) == (address, count)
         
         return False
     
+    def _start_status_poller(self):
+        """Prime the status cache and start the background poller"""
+        self._stop_status_poller()
+        self._status_cache = self._read_status()
+        self.status_version += 1
+        # A fresh event per poller: an old thread that outlived the join timeout keeps
+        # its own (set) event and exits, instead of being revived by clear()
+        self._poller_stop = threading.Event()
+        self._poller_thread = threading.Thread(target=self._poll_loop, args=(self._poller_stop,),
+                                               daemon=True)
+        self._poller_thread.start()
+    
+    def _stop_status_poller(self):
+        """Stop the background poller if it is running"""
+        self._poller_stop.set()
+        if self._poller_thread and self._poller_thread.is_alive() \
+                and self._poller_thread is not threading.current_thread():
+            self._poller_thread.join(timeout=1.0)
+        self._poller_thread = None
+    
+    def _poll_loop(self, stop: threading.Event):
+        """Background thread: refresh the status cache every STATUS_POLL_INTERVAL
+        
+        A dropped link is reconnected from here, with backoff, instead of waiting for
+        the next user command to hit the retry path; status reports connected: False
+        until it is back.
+        """
+        delay = self.STATUS_POLL_INTERVAL
+        retry_delay = self.LINK_RETRY_MIN
+        while not stop.wait(delay):
+            delay = self.STATUS_POLL_INTERVAL
+            if self._link_down:
+                if self._status_cache.get("connected"):
+                    self._status_cache = dict(self._status_cache, connected=False)
+                    self.status_version += 1
+                if not self._reconnect():
+                    delay = retry_delay
+                    retry_delay = min(retry_delay * 2, self.LINK_RETRY_MAX)
+                    continue
+                retry_delay = self.LINK_RETRY_MIN
+            
+            # Skip this cycle if commands are already waiting for the socket
+            if not self._tx_queue.empty():
+                continue
+            snapshot = self._read_status()
+            if snapshot != self._status_cache:
+                self._status_cache = snapshot
+                self.status_version += 1
+    
     def get_status(self) -> Dict[str, Any]:
-        """Get comprehensive gripper status"""
+        """Get comprehensive gripper status (latest snapshot from the background poller)"""
         if not self.connected:
             return {"connected": False, "error": "Not connected"}
         
-        # Read various status registers
-        status_reg = self._read_holding_register(256)  # 0x0100 Status
-        width_reg = self._read_holding_register(257)   # 0x0101 External width
-        internal_width_reg = self._read_holding_register(258)  # 0x0102 Internal width
-        min_reg = self._read_holding_register(259)     # 0x0103 Min external width
-        max_reg = self._read_holding_register(260)     # 0x0104 Max external width
-        min_internal_reg = self._read_holding_register(261)  # 0x0105 Min internal width
-        max_internal_reg = self._read_holding_register(262)  # 0x0106 Max internal width
-        force_reg = self._read_holding_register(263)   # 0x0107 Current force
-        max_force_reg = self._read_holding_register(1029)  # 0x0405 Maximum force
+        return dict(self._status_cache)
+    
+    def _read_status(self) -> Dict[str, Any]:
+        """Read the status registers from the gripper"""
+        # Only the registers that change are polled: status, external and internal width
+        # (0x0100-0x0102) and current force (0x0107) in one 8-register block - the limits
+        # in between ride along for free - plus maximum force (0x0405). Both reads go
+        # out back-to-back before waiting on either.
+        block_future = self._submit_modbus_request(0x03, _READ_PDU.pack(0x03, 256, 8))
+        max_force_future = self._submit_modbus_request(0x03, _READ_PDU.pack(0x03, 1029, 1))
+        
+        regs = self._parse_registers(self._wait_response(block_future), 8)
+        max_force_regs = self._parse_registers(self._wait_response(max_force_future), 1)
+        if regs is not None:
+            status_reg, width_reg, internal_width_reg = regs[:3]
+            force_reg = regs[7]
+        else:
+            status_reg, width_reg, internal_width_reg, force_reg = None, None, None, None
+        max_force_reg = max_force_regs[0] if max_force_regs is not None else None
+        min_reg, max_reg = self._min_ext, self._max_ext
+        min_internal_reg, max_internal_reg = self._min_int, self._max_int
         
         result = {
-            "connected": self.connected,
+            "connected": self.connected and not self._link_down,
             "product_code": self.product_code,
             "model_type": self.model_type,
             "width_mm": width_reg / 10.0 if width_reg is not None else None,
@@ -227,10 +651,14 @@ class OnRobotGripper:
         
         return result
     
-    def move_to_width(self, width_mm: float, force_n: int = 20, speed_percent: int = 50) -> bool:
-        """Move gripper to a specific width (main function for both open/close)"""
+    def move_to_width(self, width_mm: float, force_n: int = 20, speed_percent: int = 50,
+                      wait: bool = False) -> bool:
+        """Move gripper to a specific width (main function for both open/close)
+        
+        With wait=True, also block until the gripper reports it is no longer busy.
+        """
         if not self.connected:
-            print("[GRIPPER] Not connected")
+            log.warning("[GRIPPER] Not connected")
             return False
         
         # Clamp speed to valid range (10-100%)
@@ -239,48 +667,53 @@ class OnRobotGripper:
         # Convert width to gripper units (1/10 mm)
         target_width_units = int(width_mm * 10)
         
-        print(f"[GRIPPER] Moving to {width_mm}mm ({target_width_units} units)...")
+        log.debug("[GRIPPER] Moving to %smm (%d units)...", width_mm, target_width_units)
         
         # Check against hardware limits if available
         if self.model_limits:
             min_limit, max_limit = self.model_limits
             if width_mm < min_limit:
-                print(f"[GRIPPER] Warning: {width_mm}mm below minimum {min_limit}mm, clamping to {min_limit}mm")
+                log.warning("[GRIPPER] Warning: %smm below minimum %smm, clamping to %smm", width_mm, min_limit, min_limit)
                 width_mm = min_limit
                 target_width_units = int(width_mm * 10)
             elif width_mm > max_limit:
-                print(f"[GRIPPER] Warning: {width_mm}mm above maximum {max_limit}mm, clamping to {max_limit}mm")
+                log.warning("[GRIPPER] Warning: %smm above maximum %smm, clamping to %smm", width_mm, max_limit, max_limit)
                 width_mm = max_limit
                 target_width_units = int(width_mm * 10)
         
-        # Set parameters according to protocol
+        # Set parameters and command in one write, so the grip never latches stale setpoints
         # Address 0x0000: Target width (in 1/10 mm units)
-        if not self._write_single_register(0, target_width_units):
-            print("[GRIPPER] Failed to set target width")
-            return False
-        
         # Address 0x0001: Target force (in N)
-        if not self._write_single_register(1, force_n):
-            print("[GRIPPER] Failed to set target force")
-            return False
-        
         # Address 0x0002: Target speed (in %, clamped to 10-100%)
-        if not self._write_single_register(2, speed_percent):
-            print("[GRIPPER] Failed to set target speed")
-            return False
-        
         # Address 0x0003: Command (1 = Grip external)
-        if not self._write_single_register(3, 1):
-            print("[GRIPPER] Failed to execute grip command")
+        if not self._write_multiple_registers(0, [target_width_units, force_n, speed_percent, 1]):
+            log.error("[GRIPPER] Failed to send grip command")
             return False
         
-        print(f"[GRIPPER] ✓ Command sent: width={width_mm}mm, force={force_n}N, speed={speed_percent}%")
+        log.debug("[GRIPPER] ✓ Command sent: width=%smm, force=%sN, speed=%s%%", width_mm, force_n, speed_percent)
+        
+        if wait and not self.wait_until_idle():
+            log.warning("[GRIPPER] Still busy after move to %smm", width_mm)
+            return False
         return True
     
+    def wait_until_idle(self, timeout: float = 5.0, poll_start: float = 0.005, poll_cap: float = 0.05) -> bool:
+        """Poll only the status register (0x0100) until the busy bit clears, backing off between reads"""
+        deadline = time.monotonic() + timeout
+        delay = poll_start
+        while time.monotonic() < deadline:
+            # Sleep first: the busy bit may not be set yet right after a command
+            time.sleep(delay)
+            status_reg = self._read_holding_register(256)
+            if status_reg is not None and not (status_reg & 0x0001):
+                return True
+            delay = min(poll_cap, delay * 1.5)
+        return False
+    
     def open(self, width_mm: Optional[float] = None, force_n: int = 20, speed_percent: int = 50) -> bool:
         """Open gripper to specified width"""
         if not self.connected:
-            print("[GRIPPER] Not connected")
+            log.warning("[GRIPPER] Not connected")
             return False
         
         # If no width specified, use default of 20mm
@@ -290,13 +723,13 @@ class OnRobotGripper:
         # Clamp speed
         speed_percent = max(10, min(100, speed_percent))
         
-        print(f"[GRIPPER] Opening to {width_mm}mm...")
+        log.debug("[GRIPPER] Opening to %smm...", width_mm)
         return self.move_to_width(width_mm, force_n, speed_percent)
     
     def close(self, width_mm: Optional[float] = None, force_n: int = 20, speed_percent: int = 50) -> bool:
         """Close gripper to specified width"""
         if not self.connected:
-            print("[GRIPPER] Not connected")
+            log.warning("[GRIPPER] Not connected")
             return False
         
         # If no width specified, use default of 0.3mm
@@ -306,7 +739,7 @@ class OnRobotGripper:
         # Clamp speed
         speed_percent = max(10, min(100, speed_percent))
         
-        print(f"[GRIPPER] Closing to {width_mm}mm...")
+        log.debug("[GRIPPER] Closing to %smm...", width_mm)
         return self.move_to_width(width_mm, force_n, speed_percent)
     
     def stop(self) -> bool:
@@ -314,11 +747,11 @@ class OnRobotGripper:
         if not self.connected:
             return False
         
-        print("[GRIPPER] Stopping gripper...")
+        log.debug("[GRIPPER] Stopping gripper...")
         # Address 0x0003: Command (3 = Stop)
         result = self._write_single_register(3, 3)
         if result:
-            print("[GRIPPER] ✓ Stopped")
+            log.debug("[GRIPPER] ✓ Stopped")
         return result
     
     def set_finger_length(self, length_mm: float) -> bool:
@@ -327,8 +760,8 @@ class OnRobotGripper:
             return False
         
         length_units = int(length_mm * 10)
-        print(f"[GRIPPER] Setting finger length to {length_mm}mm ({length_units} units)...")
-        return self._write_single_register(1024, length_units)
+        log.debug("[GRIPPER] Setting finger length to %smm (%d units)...", length_mm, length_units)
+        return self._write_multiple_registers(1024, [length_units])
     
     def set_finger_height(self, height_mm: float) -> bool:
         """Set finger height in 1/10 mm (Address 0x0401)"""
@@ -336,8 +769,8 @@ class OnRobotGripper:
             return False
         
         height_units = int(height_mm * 10)
-        print(f"[GRIPPER] Setting finger height to {height_mm}mm ({height_units} units)...")
-        return self._write_single_register(1025, height_units)
+        log.debug("[GRIPPER] Setting finger height to %smm (%d units)...", height_mm, height_units)
+        return self._write_multiple_registers(1025, [height_units])
     
     def set_finger_orientation(self, orientation: int) -> bool:
         """Set finger orientation (0 = inward, 1 = outward) (Address 0x0402)"""
@@ -345,11 +778,11 @@ class OnRobotGripper:
             return False
         
         if orientation not in [0, 1]:
-            print(f"[GRIPPER] Invalid orientation: {orientation} (must be 0 or 1)")
+            log.warning("[GRIPPER] Invalid orientation: %s (must be 0 or 1)", orientation)
             return False
         
-        print(f"[GRIPPER] Setting finger orientation to {orientation}...")
-        return self._write_single_register(1026, orientation)
+        log.debug("[GRIPPER] Setting finger orientation to %s...", orientation)
+        return self._write_multiple_registers(1026, [orientation])
     
     def set_fingertip_offset(self, offset_mm: float) -> bool:
         """Set fingertip offset in 1/100 mm (Address 0x0403)"""
@@ -357,12 +790,26 @@ class OnRobotGripper:
             return False
         
         offset_units = int(offset_mm * 100)
-        print(f"[GRIPPER] Setting fingertip offset to {offset_mm}mm ({offset_units} units)...")
-        return self._write_single_register(1027, offset_units)
+        log.debug("[GRIPPER] Setting fingertip offset to %smm (%d units)...", offset_mm, offset_units)
+        return self._write_multiple_registers(1027, [offset_units])
+    
+    def configure_fingers(self, length_mm: float, height_mm: float, orientation: int, offset_mm: float) -> bool:
+        """Set finger length, height, orientation and fingertip offset in one write (0x0400-0x0403)"""
+        if not self.connected:
+            return False
+        
+        if orientation not in [0, 1]:
+            log.warning("[GRIPPER] Invalid orientation: %s (must be 0 or 1)", orientation)
+            return False
+        
+        values = [int(length_mm * 10), int(height_mm * 10), orientation, int(offset_mm * 100)]
+        log.debug("[GRIPPER] Configuring fingers: length=%smm, height=%smm, orientation=%s, offset=%smm",
+                  length_mm, height_mm, orientation, offset_mm)
+        return self._write_multiple_registers(1024, values)
 
 
 # ===================================================================
-# UR3e Robot Arm Controller (UNCHANGED)
+# UR3e Robot Arm Controller
 # ===================================================================
 class URRobotArm:
     """Controller for UR3e robot arm"""
@@ -370,88 +817,270 @@ class URRobotArm:
     # Movement parameters from original bridge
     ACCELERATION = 0.3
     VELOCITY = 0.15
+    
+    # URScript templates, filled straight from a pose dict; a/v and the newline are baked in
+    _MOVEL_FMT = ("movel(p[{x:.5f}, {y:.5f}, {z:.5f}, {rx:.5f}, {ry:.5f}, {rz:.5f}], "
+                  f"a={ACCELERATION}, v={VELOCITY})\n").format_map
+    _MOVEJ_FMT = ("movej(p[{x:.5f}, {y:.5f}, {z:.5f}, {rx:.5f}, {ry:.5f}, {rz:.5f}], "
+                  f"a={ACCELERATION}, v={VELOCITY})\n").format_map
+    _HELLO_CMD = b'textmsg("WebSocket Bridge Connected")\n'
+    
+    # Move completion is read from the real-time state stream (port 30003)
+    MOVE_TIMEOUT = 20.0       # hard ceiling for any single move
+    MOVE_START_TIMEOUT = 0.5  # a move that hasn't started by now is treated as already there
+    MOVE_POLL_INTERVAL = 0.008
+    JOINT_STEADY_SPEED = 0.001  # rad/s; below this on every joint the arm counts as still
+    
+    # Byte offsets in the real-time interface packet (from the start, size field included)
+    QD_ACTUAL_OFFSET = 300
+    PROGRAM_STATE_OFFSET = 1052  # Present on CB3.5+ / e-Series
+    PROGRAM_RUNNING = 2.0
+    
+    # Fixed waits, only used when the state stream is unavailable
     MOVE_WAIT_TIME = 3.5      # seconds for clearance moves
     VERTICAL_WAIT_TIME = 1.0  # seconds for vertical moves
     RESTING_WAIT_TIME = 4.0   # seconds for resting position moves
     
-    def __init__(self, ip="192.168.1.20", port=30002):
+    RECONNECT_ATTEMPTS = 3
+    RECONNECT_BACKOFF = 0.1
+    
+    def __init__(self, ip="192.168.1.20", port=30002, state_port=30003,
+                 reactor: Optional[SocketReactor] = None):
         self.ip = ip
         self.port = port
+        self.state_port = state_port
         self.socket = None
         self.connected = False
+        # Latest (sequence, program_running, joints_moving) from the state stream
+        self.state_socket = None
+        self._state = (0, False, False)
+        self._state_running = False
+        self._state_buf = bytearray(4096)
+        self._state_len = 0  # Bytes of a partial packet currently held in _state_buf
+        self._reactor = reactor or SocketReactor()
         
     def connect(self) -> bool:
         """Connect to UR3e robot"""
         print(f"[UR3e] Connecting to {self.ip}:{self.port}...")
         
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(10)
-            self.socket.connect((self.ip, self.port))
-            self.connected = True
+            self._open_socket()
             
             # Test connection
-            self._send_command("textmsg(\"WebSocket Bridge Connected\")")
+            self._send_raw(self._HELLO_CMD)
             print(f"[UR3e] ✓ Connected to UR3e at {self.ip}:{self.port}")
+            self._start_state_stream()
             return True
             
-        except Exception as e:
+        except OSError as e:
             print(f"[UR3e] ✗ Connection failed: {e}")
             self.connected = False
             return False
     
+    def _open_socket(self):
+        """(Re)open the URScript command socket"""
+        if self.socket:
+            self.socket.close()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.settimeout(10)
+        _tune_socket(self.socket)
+        self.socket.connect((self.ip, self.port))
+        _set_quickack(self.socket)
+        _enable_keepalive(self.socket)
+        self.connected = True
+    
+    def _reconnect(self) -> bool:
+        """Re-open the command socket after a send failure, with exponential backoff"""
+        delay = self.RECONNECT_BACKOFF
+        for attempt in range(1, self.RECONNECT_ATTEMPTS + 1):
+            try:
+                self._open_socket()
+                print(f"[UR3e] ✓ Reconnected (attempt {attempt})")
+                return True
+            except OSError as e:
+                print(f"[UR3e] Reconnect attempt {attempt} failed: {e}")
+                time.sleep(delay)
+                delay *= 2
+        self.connected = False
+        return False
+    
+    def _start_state_stream(self):
+        """Open the real-time state interface used to detect move completion"""
+        self._stop_state_stream()  # A reconnect must not leave the old socket registered
+        try:
+            self.state_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.state_socket.settimeout(1.0)
+            _tune_socket(self.state_socket)
+            self.state_socket.connect((self.ip, self.state_port))
+            _enable_keepalive(self.state_socket)  # A dead link then errors instead of going silent
+        except Exception as e:
+            print(f"[UR3e] ⚠️  State interface unavailable ({e}) - using fixed move waits")
+            self.state_socket = None
+            return
+        
+        self._state_len = 0
+        self._state_running = True
+        self._reactor.register(self.state_socket,
+                               functools.partial(self._on_state_readable, self.state_socket))
+        print(f"[UR3e] ✓ State interface connected on port {self.state_port}")
+    
+    def _stop_state_stream(self):
+        """Detach the state socket from the reactor and close it"""
+        self._state_running = False
+        if self.state_socket:
+            self._reactor.unregister(self.state_socket)
+            self.state_socket.close()
+            self.state_socket = None
+    
+    def _on_state_readable(self, sock: socket.socket):
+        """Reactor callback: keep the latest program/motion state from port 30003"""
+        if sock is not self.state_socket:
+            return  # Already replaced by a reconnect; its reads are stale
+        buf = self._state_buf
+        try:
+            nread = sock.recv_into(memoryview(buf)[self._state_len:])
+        except (BlockingIOError, InterruptedError, socket.timeout):
+            return
+        except OSError as e:
+            self._on_state_error(f"State stream error: {e}")
+            return
+        if not nread:
+            self._on_state_error("State connection closed by robot")
+            return
+        self._state_len += nread
+        
+        sequence = self._state[0]
+        running, moving = self._state[1], self._state[2]
+        offset = 0
+        while self._state_len - offset >= 4:
+            packet_size = _UR_PACKET_SIZE.unpack_from(buf, offset)[0]
+            if packet_size < 4 or packet_size > len(buf):
+                self._on_state_error(f"Bad state packet size {packet_size}, state stream stopped")
+                return
+            if self._state_len - offset < packet_size:
+                break  # Rest of the packet is still on the wire
+            
+            # Only the newest complete packet matters, but each one is decoded so the
+            # sequence counter still ticks once per packet
+            moving = False
+            if packet_size >= self.QD_ACTUAL_OFFSET + 48:
+                moving = max(abs(qd) for qd in _UR_JOINT_SPEEDS.unpack_from(buf, offset + self.QD_ACTUAL_OFFSET)) \
+                    > self.JOINT_STEADY_SPEED
+            running = False
+            if packet_size >= self.PROGRAM_STATE_OFFSET + 8:
+                running = _UR_DOUBLE.unpack_from(buf, offset + self.PROGRAM_STATE_OFFSET)[0] == self.PROGRAM_RUNNING
+            sequence += 1
+            offset += packet_size
+        
+        if offset:
+            remaining = self._state_len - offset
+            if remaining:
+                buf[:remaining] = buf[offset:self._state_len]
+            self._state_len = remaining
+            self._state = (sequence, running, moving)
+    
+    def _on_state_error(self, message: str):
+        """Stop using the state stream; moves fall back to fixed waits"""
+        print(f"[UR3e] ⚠️  {message}")
+        self._state_running = False
+        if self.state_socket:
+            self._reactor.unregister(self.state_socket)
+    
+    def _wait_for_move(self, fallback_wait: float) -> bool:
+        """Block until the arm has started and finished the last move"""
+        if not self._state_running:
+            print(f"[UR3e] ⏱️  Waiting {fallback_wait:.1f}s (no state stream)...")
+            time.sleep(fallback_wait)
+            return True
+        
+        sent_seq = self._state[0]
+        start = time.monotonic()
+        started = False
+        while self._state_running:
+            time.sleep(self.MOVE_POLL_INTERVAL)
+            elapsed = time.monotonic() - start
+            sequence, running, moving = self._state
+            # Deadline first: a stalled stream never delivers the packet waited on below
+            if elapsed > self.MOVE_TIMEOUT:
+                if sequence == sent_seq:
+                    self._on_state_error(f"No state packets for {self.MOVE_TIMEOUT:.0f}s - using fixed move waits")
+                print(f"[UR3e] ⚠️  Move did not finish within {self.MOVE_TIMEOUT:.0f}s")
+                return False
+            if sequence == sent_seq:
+                # No packet since the command went out yet
+                continue
+            
+            if running or moving:
+                started = True
+            elif started or elapsed > self.MOVE_START_TIMEOUT:
+                return True
+        
+        # Stream dropped mid-move
+        time.sleep(fallback_wait)
+        return True
+    
     def disconnect(self):
         """Disconnect from robot"""
+        self._stop_state_stream()
         if self.socket:
             self.socket.close()
             self.socket = None
         self.connected = False
         print("[UR3e] Disconnected")
     
-    def _send_command(self, command: str, wait_time: float = 0.1) -> bool:
-        """Send command to UR3e"""
+    def _send_command(self, command: str, wait_time: float = 0.0) -> bool:
+        """Send command to UR3e (pass wait_time only where the caller really needs pacing)"""
+        if not self._send_raw((command + "\n").encode()):
+            return False
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return True
+    
+    def _send_raw(self, data: bytes) -> bool:
+        """Send an already newline-terminated, encoded URScript line"""
         if not self.connected or not self.socket:
             print("[UR3e] Not connected")
             return False
         
         try:
-            full_cmd = command + "\n"
-            self.socket.sendall(full_cmd.encode())
-            time.sleep(wait_time)
-            return True
-        except Exception as e:
-            print(f"[UR3e] Command failed: {e}")
-            self.connected = False
-            return False
+            self.socket.sendall(data)
+        except OSError as e:
+            print(f"[UR3e] Command failed: {e} - reconnecting")
+            if not self._reconnect():
+                return False
+            try:
+                self.socket.sendall(data)
+            except OSError as e:
+                print(f"[UR3e] Command failed after reconnect: {e}")
+                self.connected = False
+                return False
+        return True
     
     def move_to_pose(self, pose: Dict[str, float], move_type: str = "clearance") -> bool:
         """Move to a specific pose"""
         if not self.connected:
             return False
         
-        # Determine wait time based on move type
+        # Determine fallback wait time based on move type
         if move_type == "vertical":
             wait_time = self.VERTICAL_WAIT_TIME
             # Use movel for vertical moves (linear, precise)
-            cmd = (f"movel(p[{pose['x']:.5f}, {pose['y']:.5f}, {pose['z']:.5f}, "
-                   f"{pose['rx']:.5f}, {pose['ry']:.5f}, {pose['rz']:.5f}], "
-                   f"a={self.ACCELERATION}, v={self.VELOCITY})")
+            cmd = self._MOVEL_FMT(pose)
         else:
             wait_time = self.MOVE_WAIT_TIME if move_type == "clearance" else self.RESTING_WAIT_TIME
             # Use movej for clearance/resting moves (fast, joint space)
-            cmd = (f"movej(p[{pose['x']:.5f}, {pose['y']:.5f}, {pose['z']:.5f}, "
-                   f"{pose['rx']:.5f}, {pose['ry']:.5f}, {pose['rz']:.5f}], "
-                   f"a={self.ACCELERATION}, v={self.VELOCITY})")
+            cmd = self._MOVEJ_FMT(pose)
         
         # Send command
-        if not self._send_command(cmd):
+        if not self._send_raw(cmd.encode()):
             return False
         
         # Wait for move to complete
-        print(f"[UR3e] ⏱️  Waiting {wait_time:.1f}s for {move_type} move...")
-        time.sleep(wait_time)
+        start = time.monotonic()
+        if not self._wait_for_move(wait_time):
+            return False
         
-        print(f"[UR3e] ✓ Move completed: {move_type}")
+        print(f"[UR3e] ✓ Move completed: {move_type} ({time.monotonic() - start:.2f}s)")
         return True
     
     def get_status(self) -> Dict[str, Any]:
@@ -470,11 +1099,14 @@ class RobotSystem:
     """Combines UR3e arm and OnRobot gripper with enhanced width control"""
     
     def __init__(self):
-        self.arm = URRobotArm()
-        self.gripper = OnRobotGripper()
+        # One reactor thread drains both the gripper replies and the arm state stream
+        self.reactor = SocketReactor()
+        self.arm = URRobotArm(reactor=self.reactor)
+        self.gripper = OnRobotGripper(reactor=self.reactor)
         self.connected = False
         self.last_open_width = None
         self.last_close_width = None
+        self._status_version = 0  # Bumped whenever state owned here changes
         
     def connect(self) -> bool:
         """Connect to both arm and gripper"""
@@ -499,6 +1131,7 @@ class RobotSystem:
             return False
         
         self.connected = True
+        self._status_version += 1
         print("\n" + "=" * 60)
         print("✅ SYSTEM READY: Both arm and gripper connected!")
         print("=" * 60)
@@ -510,6 +1143,7 @@ class RobotSystem:
         self.arm.disconnect()
         self.gripper.disconnect()
         self.connected = False
+        self._status_version += 1
         print("[SYSTEM] Disconnected")
     
     def execute_move(self, pose: Dict[str, float], move_type: str = "clearance") -> bool:
@@ -528,11 +1162,13 @@ class RobotSystem:
             success = self.gripper.open(width_mm, force_n, speed_percent)
             if success and width_mm is not None:
                 self.last_open_width = width_mm
+                self._status_version += 1
             return success
         elif action == "close":
             success = self.gripper.close(width_mm, force_n, speed_percent)
             if success and width_mm is not None:
                 self.last_close_width = width_mm
+                self._status_version += 1
             return success
         elif action == "stop":
             return self.gripper.stop()
@@ -545,6 +1181,11 @@ class RobotSystem:
             print(f"[SYSTEM] Unknown gripper action: {action}")
             return False
     
+    def status_key(self) -> Tuple[int, int, bool, bool]:
+        """Changes whenever get_status() could return something different"""
+        return (self._status_version, self.gripper.status_version,
+                self.arm.connected, self.gripper.connected)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get complete system status"""
         gripper_status = self.gripper.get_status()
@@ -563,237 +1204,358 @@ class RobotSystem:
 # ===================================================================
 # WebSocket Bridge Server (UPDATED for width control)
 # ===================================================================
+_GRIPPER_ACTIONS = frozenset({"open", "close", "stop", "move_to_width"})
+
+_STARTUP_BANNER = "\n".join([
+    "",
+    "=" * 60,
+    "🚀 WEB SOCKET ROBOT BRIDGE WITH WIDTH CONTROL",
+    "=" * 60,
+    "📡 Listening on: ws://%s:%s",
+    "🤖 Supported commands:",
+    "  • connect - Connect to robot system",
+    "  • disconnect - Disconnect from robot system",
+    "  • status - Get system status",
+    "  • move - Move robot arm (with pose and moveType)",
+    "  • gripper - Control gripper (open/close/stop/move_to_width)",
+    "  • set_gripper_config - Set gripper parameters",
+    "  • test - Test command",
+    "  • set_options - Per-connection options (batch_replies)",
+    "",
+    "💡 Example gripper commands:",
+    '  {"type": "gripper", "action": "open", "width_mm": 20.0, "force_n": 20, "speed_percent": 50}',
+    '  {"type": "gripper", "action": "close", "width_mm": 0.3, "force_n": 20, "speed_percent": 50}',
+    '  {"type": "gripper", "action": "move_to_width", "width_mm": 15.0, "force_n": 20, "speed_percent": 50}',
+    "=" * 60,
+    "",
+])
+
+
 class WebSocketBridge:
     """WebSocket server for robot control with width adjustment"""
     
+    MAX_BATCH = 128  # replies coalesced into one frame for clients that opted in
+    # The bridge is meant for a trusted LAN/localhost client: no per-message deflate and a
+    # modest frame cap, since robot commands are a few hundred bytes
+    WS_MAX_SIZE = 2 ** 20
+    WS_PING_INTERVAL = 20
+    DRAIN_TIMEOUT = 5.0  # seconds queued replies get to go out after the client stops sending
+    
     def __init__(self):
         self.robot = RobotSystem()
-        self.clients = set()
+        # Connections drop out on their own once closed and collected; to broadcast,
+        # snapshot with list(self.clients) first
+        self.clients = weakref.WeakSet()
+        
+        # Only the timestamp changes between welcomes: serialize the rest once and
+        # splice the time in per connection
+        welcome = {
+            "type": "welcome",
+            "message": "Robot WebSocket Bridge Connected",
+            "timestamp": "__timestamp__",
+            "system": "UR3e + OnRobot 2FG7/2FG14",
+            "gripper_ip": "192.168.1.1:502",
+            "arm_ip": "192.168.1.20:30002",
+            "features": ["width_adjustment", "force_control", "speed_control", "batch_replies"],
+            "transport": {"compression": None, "max_size": self.WS_MAX_SIZE, "trusted_network_only": True}
+        }
+        self._welcome_prefix, self._welcome_suffix = _json_dumps(welcome).split('"__timestamp__"')
+        
+        # Replies whose shape never changes are serialized once; handlers return these
+        # strings directly (or fill their %s slots in a single % pass)
+        self._reply_not_connected = _json_dumps({"type": "error", "message": "Robot not connected"})
+        self._reply_no_pose = _json_dumps({"type": "error", "message": "No pose provided"})
+        self._reply_move_failed = _json_dumps({"type": "error", "message": "Move failed"})
+        self._reply_disconnected = _json_dumps({"type": "disconnected", "message": "Robot system disconnected"})
+        self._tpl_gripper_ok = _json_dumps({
+            "type": "gripper_complete",
+            "message": "Gripper __ACTION__ completed",
+            "action": "__ACTION__",
+            "width_mm": "__W__",
+            "force_n": "__F__",
+            "speed_percent": "__S__"
+        }).replace("%", "%%").replace("__ACTION__", "%s").replace(
+            '"__W__"', "%s").replace('"__F__"', "%s").replace('"__S__"', "%s")
+        # Slots in order: action (message), action, width, force, speed. Filled in one
+        # pass, so a client string can never be mistaken for a later placeholder
+        
+        # Serialized status reply for one robot.status_key(), split around the timestamp
+        self._status_key = None
+        self._status_prefix = ""
+        self._status_suffix = ""
+        
+        # Message type -> handler coroutine
+        self._handlers = {
+            "connect": self._h_connect,
+            "disconnect": self._h_disconnect,
+            "status": self._h_status,
+            "move": self._h_move,
+            "gripper": self._h_gripper,
+            "set_gripper_config": self._h_config,
+            "test": self._h_test,
+        }
     
     async def handle_client(self, websocket):
         """Handle a WebSocket client connection"""
         client_id = id(websocket)
-        print(f"\n[WS] 🔌 New client connected: {client_id}")
+        ws_log.info("[WS] 🔌 New client connected: %s", client_id)
         self.clients.add(websocket)
         
+        # Replies go through a per-connection queue drained by one writer task.
+        # "batch_replies" is off until the client sends {"type": "set_options", "batch_replies": true}.
+        outbox: asyncio.Queue = asyncio.Queue()
+        session = {"batch_replies": False}
+        writer = asyncio.ensure_future(self._writer(websocket, outbox, session))
+        
         try:
             # Send welcome message
-            welcome = {
-                "type": "welcome",
-                "message": "Robot WebSocket Bridge Connected",
-                "timestamp": time.time(),
-                "system": "UR3e + OnRobot 2FG7/2FG14",
-                "gripper_ip": "192.168.1.1:502",
-                "arm_ip": "192.168.1.20:30002",
-                "features": ["width_adjustment", "force_control", "speed_control"]
-            }
-            await websocket.send(json.dumps(welcome))
+            await websocket.send(self._welcome_prefix + repr(time.time()) + self._welcome_suffix)
             
-            # Main message loop
+            # Main message loop - one reusable simdjson parser per connection
+            parser = simdjson.Parser() if simdjson is not None else None
             async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    print(f"[WS] 📥 From {client_id}: {json.dumps(data)}")
-                    
-                    # Handle different message types
-                    response = await self._handle_message(data)
-                    if response:
-                        await websocket.send(json.dumps(response))
-                        
-                except json.JSONDecodeError:
-                    error = {"type": "error", "message": "Invalid JSON"}
-                    await websocket.send(json.dumps(error))
-                except Exception as e:
-                    error = {"type": "error", "message": f"Processing error: {str(e)}"}
-                    await websocket.send(json.dumps(error))
+                await self._handle_frame(outbox, session, client_id, parser, message)
+            
+            # Let queued replies go out before the connection is dropped. The writer may
+            # already be gone (send error, closed peer), and then nothing would ever finish
+            # the join - so stop on whichever comes first, bounded by DRAIN_TIMEOUT
+            drained = asyncio.ensure_future(outbox.join())
+            await asyncio.wait({drained, writer}, timeout=self.DRAIN_TIMEOUT,
+                               return_when=asyncio.FIRST_COMPLETED)
+            drained.cancel()
                     
         except websockets.exceptions.ConnectionClosed:
-            print(f"[WS] 🔌 Client disconnected: {client_id}")
+            ws_log.info("[WS] 🔌 Client disconnected: %s", client_id)
         finally:
-            self.clients.remove(websocket)
-    
-    async def _handle_message(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Handle incoming WebSocket messages"""
-        msg_type = data.get("type")
-        
-        if msg_type == "connect":
-            # Connect to robot system
-            if self.robot.connect():
-                status = self.robot.get_status()
-                return {
-                    "type": "connected",
-                    "message": "Robot system connected successfully",
-                    "status": status
-                }
+            writer.cancel()
+    
+    async def _writer(self, websocket, outbox: asyncio.Queue, session: Dict[str, bool]):
+        """Send queued replies, coalescing whatever is ready into one JSON array frame"""
+        while True:
+            batch = [await outbox.get()]
+            while len(batch) < self.MAX_BATCH and not outbox.empty():
+                batch.append(outbox.get_nowait())
+            try:
+                if session["batch_replies"]:
+                    # Items are already-serialized JSON objects, so joining them is enough
+                    await websocket.send("[" + ",".join(batch) + "]")
+                else:
+                    for reply in batch:
+                        await websocket.send(reply)
+            except websockets.exceptions.ConnectionClosed:
+                return
+            finally:
+                for _ in batch:
+                    outbox.task_done()
+    
+    async def _handle_frame(self, outbox: asyncio.Queue, session: Dict[str, bool], client_id: int,
+                            parser, message):
+        """Parse, dispatch and queue the reply for one inbound frame.
+        
+        Kept as its own coroutine so the lazy simdjson document is released when it
+        returns - the parser refuses to parse again while the previous one is alive.
+        Replies are queued already serialized for the same reason.
+        """
+        try:
+            if parser is not None:
+                data = parser.parse(message.encode() if isinstance(message, str) else message)
             else:
-                return {
-                    "type": "error",
-                    "message": "Failed to connect to robot system"
-                }
-        
-        elif msg_type == "disconnect":
-            # Disconnect from robot system
-            self.robot.disconnect()
+                data = _json_loads(message)
+        except ValueError:  # simdjson, orjson and json decode errors are all ValueErrors
+            error = {"type": "error", "message": "Invalid JSON"}
+            outbox.put_nowait(_json_dumps(error))
+            return
+        
+        try:
+            ws_log.debug("[WS] 📥 From %s: %s", client_id, data)
+            
+            msg_type = data.get("type")
+            if msg_type == "set_options":
+                # Per-connection options live here rather than in _handle_message
+                session["batch_replies"] = bool(data.get("batch_replies", session["batch_replies"]))
+                outbox.put_nowait(_json_dumps({"type": "options_set", **session}))
+                return
+            
+            # Handle different message types
+            response = await self._handle_message(data, msg_type)
+            if response:
+                outbox.put_nowait(response if isinstance(response, str) else _json_dumps(response))
+                
+        except Exception as e:
+            error = {"type": "error", "message": f"Processing error: {str(e)}"}
+            outbox.put_nowait(_json_dumps(error))
+    
+    async def _handle_message(self, data: Dict[str, Any],
+                              msg_type: Optional[str] = None) -> Optional[Union[Dict[str, Any], str]]:
+        """Handle incoming WebSocket messages (a str reply is already-serialized JSON)"""
+        if msg_type is None:
+            msg_type = data.get("type")
+        handler = self._handlers.get(msg_type)
+        if handler is None:
             return {
-                "type": "disconnected",
-                "message": "Robot system disconnected"
+                "type": "error",
+                "message": f"Unknown message type: {msg_type}"
             }
-        
-        elif msg_type == "status":
-            # Get system status
+        return await handler(data)
+    
+    async def _h_connect(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Connect to robot system"""
+        if self.robot.connect():
+            status = self.robot.get_status()
+            return {
+                "type": "connected",
+                "message": "Robot system connected successfully",
+                "status": status
+            }
+        else:
             return {
+                "type": "error",
+                "message": "Failed to connect to robot system"
+            }
+    
+    async def _h_disconnect(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Disconnect from robot system"""
+        self.robot.disconnect()
+        return self._reply_disconnected
+    
+    async def _h_status(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Get system status"""
+        # Status changes far less often than clients poll it: reuse the serialized
+        # reply until the robot's status key moves, and only splice in the time
+        key = self.robot.status_key()
+        if key != self._status_key:
+            reply = _json_dumps({
                 "type": "status",
                 "status": self.robot.get_status(),
-                "timestamp": time.time()
+                "timestamp": "__timestamp__"
+            })
+            self._status_prefix, self._status_suffix = reply.split('"__timestamp__"')
+            self._status_key = key
+        return self._status_prefix + repr(time.time()) + self._status_suffix
+    
+    async def _h_move(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Execute robot move"""
+        pose = data.get("pose")
+        move_type = data.get("moveType", "clearance")
+        
+        if not pose:
+            return self._reply_no_pose
+        
+        if not self.robot.connected:
+            return self._reply_not_connected
+        
+        success = self.robot.execute_move(pose, move_type)
+        if success:
+            return {
+                "type": "move_complete",
+                "message": f"Move completed: {move_type}",
+                "pose": pose,
+                "move_type": move_type
             }
+        else:
+            return self._reply_move_failed
+    
+    async def _h_gripper(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Execute gripper action with optional parameters"""
+        action = data.get("action")
+        width_mm = data.get("width_mm")
+        force_n = data.get("force_n", 20)
+        speed_percent = data.get("speed_percent", 50)
         
-        elif msg_type == "move":
-            # Execute robot move
-            pose = data.get("pose")
-            move_type = data.get("moveType", "clearance")
-            
-            if not pose:
-                return {"type": "error", "message": "No pose provided"}
-            
-            if not self.robot.connected:
-                return {"type": "error", "message": "Robot not connected"}
-            
-            success = self.robot.execute_move(pose, move_type)
-            if success:
-                return {
-                    "type": "move_complete",
-                    "message": f"Move completed: {move_type}",
-                    "pose": pose,
-                    "move_type": move_type
-                }
+        # isinstance first: a list/object "action" is unhashable and would raise in the set lookup
+        if not isinstance(action, str) or action not in _GRIPPER_ACTIONS:
+            return {"type": "error", "message": f"Invalid gripper action: {action}"}
+        
+        if action == "move_to_width" and width_mm is None:
+            return {"type": "error", "message": "Width must be specified for move_to_width"}
+        
+        if not self.robot.connected:
+            return self._reply_not_connected
+        
+        success = self.robot.execute_gripper(action, width_mm, force_n, speed_percent)
+        if success:
+            # action is one of the four names checked above, so it needs no escaping
+            return self._tpl_gripper_ok % (action, action, _json_scalar(width_mm),
+                                           _json_scalar(force_n), _json_scalar(speed_percent))
+        else:
+            return {
+                "type": "error",
+                "message": f"Gripper {action} failed"
+            }
+    
+    async def _h_config(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Set gripper configuration parameters"""
+        if not self.robot.connected:
+            return self._reply_not_connected
+        
+        # Get the gripper object
+        gripper = self.robot.gripper
+        
+        # Apply configuration if provided
+        success = True
+        messages = []
+        
+        if "finger_length_mm" in data:
+            if gripper.set_finger_length(data["finger_length_mm"]):
+                messages.append(f"Finger length set to {data['finger_length_mm']}mm")
             else:
-                return {
-                    "type": "error",
-                    "message": "Move failed"
-                }
-        
-        elif msg_type == "gripper":
-            # Execute gripper action with optional parameters
-            action = data.get("action")
-            width_mm = data.get("width_mm")
-            force_n = data.get("force_n", 20)
-            speed_percent = data.get("speed_percent", 50)
-            
-            if action not in ["open", "close", "stop", "move_to_width"]:
-                return {"type": "error", "message": f"Invalid gripper action: {action}"}
-            
-            if action == "move_to_width" and width_mm is None:
-                return {"type": "error", "message": "Width must be specified for move_to_width"}
-            
-            if not self.robot.connected:
-                return {"type": "error", "message": "Robot not connected"}
-            
-            success = self.robot.execute_gripper(action, width_mm, force_n, speed_percent)
-            if success:
-                return {
-                    "type": "gripper_complete",
-                    "message": f"Gripper {action} completed",
-                    "action": action,
-                    "width_mm": width_mm,
-                    "force_n": force_n,
-                    "speed_percent": speed_percent
-                }
+                success = False
+                messages.append("Failed to set finger length")
+        
+        if "finger_height_mm" in data:
+            if gripper.set_finger_height(data["finger_height_mm"]):
+                messages.append(f"Finger height set to {data['finger_height_mm']}mm")
             else:
-                return {
-                    "type": "error",
-                    "message": f"Gripper {action} failed"
-                }
-        
-        elif msg_type == "set_gripper_config":
-            # Set gripper configuration parameters
-            if not self.robot.connected:
-                return {"type": "error", "message": "Robot not connected"}
-            
-            # Get the gripper object
-            gripper = self.robot.gripper
-            
-            # Apply configuration if provided
-            success = True
-            messages = []
-            
-            if "finger_length_mm" in data:
-                if gripper.set_finger_length(data["finger_length_mm"]):
-                    messages.append(f"Finger length set to {data['finger_length_mm']}mm")
-                else:
-                    success = False
-                    messages.append("Failed to set finger length")
-            
-            if "finger_height_mm" in data:
-                if gripper.set_finger_height(data["finger_height_mm"]):
-                    messages.append(f"Finger height set to {data['finger_height_mm']}mm")
-                else:
-                    success = False
-                    messages.append("Failed to set finger height")
-            
-            if "finger_orientation" in data:
-                if gripper.set_finger_orientation(data["finger_orientation"]):
-                    orientation = "inward" if data["finger_orientation"] == 0 else "outward"
-                    messages.append(f"Finger orientation set to {orientation}")
-                else:
-                    success = False
-                    messages.append("Failed to set finger orientation")
-            
-            if "fingertip_offset_mm" in data:
-                if gripper.set_fingertip_offset(data["fingertip_offset_mm"]):
-                    messages.append(f"Fingertip offset set to {data['fingertip_offset_mm']}mm")
-                else:
-                    success = False
-                    messages.append("Failed to set fingertip offset")
-            
-            if success:
-                return {
-                    "type": "config_set",
-                    "message": "Gripper configuration updated",
-                    "details": messages
-                }
+                success = False
+                messages.append("Failed to set finger height")
+        
+        if "finger_orientation" in data:
+            if gripper.set_finger_orientation(data["finger_orientation"]):
+                orientation = "inward" if data["finger_orientation"] == 0 else "outward"
+                messages.append(f"Finger orientation set to {orientation}")
+            else:
+                success = False
+                messages.append("Failed to set finger orientation")
+        
+        if "fingertip_offset_mm" in data:
+            if gripper.set_fingertip_offset(data["fingertip_offset_mm"]):
+                messages.append(f"Fingertip offset set to {data['fingertip_offset_mm']}mm")
             else:
-                return {
-                    "type": "error",
-                    "message": "Some configuration updates failed",
-                    "details": messages
-                }
-        
-        elif msg_type == "test":
-            # Test command
+                success = False
+                messages.append("Failed to set fingertip offset")
+        
+        if success:
             return {
-                "type": "test_response",
-                "message": "Test successful",
-                "received": data,
-                "timestamp": time.time()
+                "type": "config_set",
+                "message": "Gripper configuration updated",
+                "details": messages
             }
-        
         else:
             return {
                 "type": "error",
-                "message": f"Unknown message type: {msg_type}"
+                "message": "Some configuration updates failed",
+                "details": messages
             }
     
+    async def _h_test(self, data: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+        """Test command"""
+        return {
+            "type": "test_response",
+            "message": "Test successful",
+            "received": data,
+            "timestamp": time.time()
+        }
+    
     async def run(self, host="localhost", port=8765):
         """Run the WebSocket server"""
-        print("\n" + "=" * 60)
-        print("🚀 WEB SOCKET ROBOT BRIDGE WITH WIDTH CONTROL")
-        print("=" * 60)
-        print(f"📡 Listening on: ws://{host}:{port}")
-        print("🤖 Supported commands:")
-        print("  • connect - Connect to robot system")
-        print("  • disconnect - Disconnect from robot system")
-        print("  • status - Get system status")
-        print("  • move - Move robot arm (with pose and moveType)")
-        print("  • gripper - Control gripper (open/close/stop/move_to_width)")
-        print("  • set_gripper_config - Set gripper parameters")
-        print("  • test - Test command")
-        print("\n💡 Example gripper commands:")
-        print('  {"type": "gripper", "action": "open", "width_mm": 20.0, "force_n": 20, "speed_percent": 50}')
-        print('  {"type": "gripper", "action": "close", "width_mm": 0.3, "force_n": 20, "speed_percent": 50}')
-        print('  {"type": "gripper", "action": "move_to_width", "width_mm": 15.0, "force_n": 20, "speed_percent": 50}')
-        print("=" * 60 + "\n")
-        
-        server = await websockets.serve(self.handle_client, host, port)
+        # One log call (one write) instead of a print per line; skipped below INFO
+        if ws_log.isEnabledFor(logging.INFO):
+            ws_log.info(_STARTUP_BANNER, host, port)
+        
+        server = await websockets.serve(self.handle_client, host, port,
+                                        compression=None,
+                                        max_size=self.WS_MAX_SIZE,
+                                        ping_interval=self.WS_PING_INTERVAL)
         await server.wait_closed()
 
 
@@ -807,8 +1569,16 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Gripper chatter and inbound WebSocket frames are at DEBUG; raise to see them
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # uvloop's libuv transports are faster than the default loop (not available on Windows).
+    # uvloop.run() sets the loop up for this run only; install() is deprecated
+    try:
+        from uvloop import run as run_event_loop
+    except ImportError:
+        run_event_loop = asyncio.run
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         print("\n\n👋 Bridge shutdown by user")
     except Exception as e:
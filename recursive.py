@@ -1,4 +1,7 @@
 import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Root directory to start
 root_dir = r"D:\chessweb\src"
@@ -16,19 +19,51 @@ skip_files = {
     os.path.basename(output_file)  # skip the output file itself
 }
 
-with open(output_file, "w", encoding="utf-8") as out_f:
+# Files are read on a thread pool so their open/read latency overlaps, and written
+# in walk order. Anything bigger than this is streamed by the writer instead.
+MAX_WORKERS = 16
+STREAM_THRESHOLD = 1 << 20
+
+
+def read_file(file_path):
+    """Return the file's bytes, or None if it is big enough to stream instead"""
+    if os.path.getsize(file_path) > STREAM_THRESHOLD:
+        return None
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def write_entry(out_f, file_path, future):
+    out_f.write(f"----- {file_path} -----\n".encode("utf-8"))
+    try:
+        body = future.result()
+        if body is None:
+            with open(file_path, "rb") as f:
+                shutil.copyfileobj(f, out_f, 1 << 20)
+        else:
+            out_f.write(body)
+    except Exception as e:
+        out_f.write(f"[Could not read file: {e}]\n".encode("utf-8"))
+    out_f.write(b"\n\n")  # Separate files by newlines
+
+
+# Binary mode + a 1 MiB buffer: bodies go through as bytes and small writes are
+# batched into few syscalls
+with open(output_file, "wb", buffering=1 << 20) as out_f, \
+        ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+    # Bounded window of in-flight reads, consumed in submission order
+    in_flight = deque()
     for dirpath, dirnames, filenames in os.walk(root_dir):
         for filename in filenames:
             if filename in skip_files:
                 continue
 
             file_path = os.path.join(dirpath, filename)
-            out_f.write(f"----- {file_path} -----\n")
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    out_f.write(f.read())
-            except Exception as e:
-                out_f.write(f"[Could not read file: {e}]\n")
-            out_f.write("\n\n")  # Separate files by newlines
+            in_flight.append((file_path, ex.submit(read_file, file_path)))
+            if len(in_flight) >= MAX_WORKERS * 4:
+                write_entry(out_f, *in_flight.popleft())
+
+    while in_flight:
+        write_entry(out_f, *in_flight.popleft())
 
 print(f"All selected files combined into: {output_file}")
@@ -1,4 +1,7 @@
+import mmap
 import os
+import re
+import sys
 
 root_dir = r"C:\Users\Shivam\Downloads\CameraChessWeb-main2\CameraChessWeb-main\src"
 combined_file = os.path.join(root_dir, "all_files_combined.txt")
@@ -6,46 +9,75 @@ combined_file = os.path.join(root_dir, "all_files_combined.txt")
 expected_files = set()
 
 def norm(p):
-    return os.path.normpath(p)
+    # normcase: Windows volumes are case-insensitive, so compare case-folded keys
+    return os.path.normcase(os.path.normpath(p))
 
-with open(combined_file, "r", encoding="utf-8") as f:
-    text = f.read()
+# Header lines mark each block; the file is scanned through a read-only mmap so the
+# combined text is never copied into one big str, and bodies are written as bytes.
+# Headers may end in CRLF if the combined file was converted on its way here (e.g. git
+# autocrlf); the separator after each body then is CRLF too. Bodies are never touched
+HEADER_RE = re.compile(rb"^----- (.+?) -----\r?\n", re.MULTILINE)
+WRITE_CHUNK = 1 << 20
 
-# Split by delimiter lines
-blocks = text.split("----- ")
-blocks = blocks[1:]  # first split is empty
+with open(combined_file, "rb") as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    headers = list(HEADER_RE.finditer(mm))
+    if not headers:
+        # Without headers the keep-set is empty and the cleanup would delete everything
+        sys.exit(f"❌ No file headers found in {combined_file}; nothing extracted or removed")
 
-for block in blocks:
-    header, _, body = block.partition(" -----\n")
-    file_path = header.strip()
+    for i, m in enumerate(headers):
+        file_path = m.group(1).decode("utf-8").strip()
+        start = m.end()
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(mm)
 
-    # IMPORTANT: remove the separator added by combine script
-    if body.endswith("\n\n"):
-        body = body[:-2]
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # IMPORTANT: remove the separator added by combine script
+        separator = b"\r\n\r\n" if m.group(0).endswith(b"\r\n") else b"\n\n"
+        if end - start >= len(separator) and mm[end - len(separator):end] == separator:
+            end -= len(separator)
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(body)
+        # Copy straight out of the mapping in 1 MiB slices - no whole-body copy in memory
+        with open(file_path, "wb") as out_f:
+            for off in range(start, end, WRITE_CHUNK):
+                out_f.write(mm[off:min(off + WRITE_CHUNK, end)])
 
-    expected_files.add(norm(file_path))
+        expected_files.add(norm(file_path))
 
-# Delete files not listed in txt (inside src only)
-for dirpath, _, filenames in os.walk(root_dir):
-    for filename in filenames:
-        full_path = norm(os.path.join(dirpath, filename))
+# Delete files not listed in txt (inside src only) and remove directories left empty,
+# in one scandir pass instead of two os.walk traversals
+# Paths from scandir are root_dir + separator + names, so once root_dir is normalized
+# they only need normcase, not a full normpath each
+expected_files = frozenset(expected_files)
+combined_norm = norm(combined_file)
+root_prefix = norm(root_dir) + os.sep
+if not any(path.startswith(root_prefix) for path in expected_files):
+    # Headers from some other tree: pruning would treat every file here as stale
+    sys.exit(f"❌ None of the extracted paths are under {root_dir}; not removing anything")
 
-        if full_path == norm(combined_file):
-            continue
 
-        if full_path not in expected_files:
-            os.remove(full_path)
+def clean(directory):
+    """Prune directory bottom-up; return True if nothing is left in it"""
+    empty = True
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if clean(entry.path):
+                    os.rmdir(entry.path)
+                else:
+                    empty = False
+            elif entry.is_symlink() and entry.is_dir():
+                empty = False  # os.walk never descended into linked dirs; leave them be
+            else:
+                full_path = os.path.normcase(entry.path)
+                if full_path != combined_norm and full_path not in expected_files:
+                    os.remove(entry.path)
+                else:
+                    empty = False
+    return empty
 
-# Remove empty directories
-for dirpath, _, _ in os.walk(root_dir, topdown=False):
-    if dirpath == root_dir:
-        continue
-    if not os.listdir(dirpath):
-        os.rmdir(dirpath)
+
+clean(os.path.normpath(root_dir))
 
 print("✅ Exact reconstruction complete (line-count stable)")
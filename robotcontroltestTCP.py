@@ -1,28 +1,46 @@
+import asyncio
+import logging
 import socket
 import time
 import sys
 import math
 import struct
-import threading
+from collections import namedtuple
 
 # Robot configuration
 ROBOT_IP = "192.168.1.20"
 MOVE_PORT = 30002
 STATE_PORT = 30003
 
+# TCP pose; used for both targets and readings from the state stream
+Pose = namedtuple('Pose', 'x y z rx ry rz')
+
 # Tool positions in meters and radians
-A1 = {'x': 0.225, 'y': 0.139, 'z': 0.204, 'rx': 2.205, 'ry': -2.277, 'rz': 0.016}
-H1 = {'x': 0.24130, 'y': -0.05621, 'z': 0.20399, 'rx': 2.205, 'ry': -2.277, 'rz': 0.016}
-H8 = {'x': 0.43138, 'y': -0.05222, 'z': 0.20400, 'rx': 2.205, 'ry': -2.277, 'rz': 0.016}
-A8 = {'x': 0.43138, 'y': 0.13319, 'z': 0.20399, 'rx': 2.205, 'ry': -2.277, 'rz': 0.016}
+A1 = Pose(x=0.225, y=0.139, z=0.204, rx=2.205, ry=-2.277, rz=0.016)
+H1 = Pose(x=0.24130, y=-0.05621, z=0.20399, rx=2.205, ry=-2.277, rz=0.016)
+H8 = Pose(x=0.43138, y=-0.05222, z=0.20400, rx=2.205, ry=-2.277, rz=0.016)
+A8 = Pose(x=0.43138, y=0.13319, z=0.20399, rx=2.205, ry=-2.277, rz=0.016)
 
 # Movement parameters
 ACCELERATION = 0.3
 VELOCITY = 0.15
 
+# movel line as a bytes template: C-level % formatting, no str -> encode round trip
+_MOVEL_FMT = b"movel(p[%.5f, %.5f, %.5f, %.5f, %.5f, %.5f], a=%.2f, v=%.2f)"
+
+# Precompiled layouts for the state stream (avoids re-parsing the format per packet)
+_HDR = struct.Struct('>I')     # Packet size header
+_POSE = struct.Struct('!6d')   # TCP pose: X, Y, Z, Rx, Ry, Rz
+_SUBHDR = struct.Struct('>IB')  # Primary/secondary interface sub-package: length, type
+
+ROBOT_STATE_MESSAGE = 16  # Message type of state packets on ports 30001/30002
+CARTESIAN_INFO = 4        # Sub-package holding the TCP pose
+
+log = logging.getLogger("urreader")
+
 class ContinuousTCPReader:
     """
-    Continuously reads TCP pose from robot state interface in a background thread.
+    Continuously reads TCP pose from robot state interface in a background asyncio task.
     Properly handles UR packet structure with 4-byte header.
     """
     
@@ -30,131 +48,186 @@ class ContinuousTCPReader:
         self.robot_ip = robot_ip
         self.state_port = state_port
         self.socket = None
-        self.reading_thread = None
+        self.reading_task = None
         self.running = False
+        # Latest Pose. The reader only ever swaps in a new (immutable) Pose,
+        # so a single attribute read is a consistent snapshot without a lock
         self.current_pose = None
-        self.pose_lock = threading.Lock()
+        self.pose_event = asyncio.Event()  # Set whenever the pose changes
         self.connection_established = False
         self.tcp_data_offset = 444  # Your confirmed offset in the DATA part (without header)
+        self.pose_offset = None  # Pose offset in the full packet, found from the first packet
+        
+        # Fixed receive buffer; packets are received into and decoded from it in place
+        self._rxbuf = bytearray(65536)
+        self._mv = memoryview(self._rxbuf)
         
-    def connect(self):
+    async def connect(self):
         """Connect to robot state interface"""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(3.0)
-            self.socket.connect((self.robot_ip, self.state_port))
+            self.socket.setblocking(False)
+            # Larger kernel buffer so a stalled reader doesn't drop state packets
+            # (set before connect so the TCP window is sized from it)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)
+            await asyncio.wait_for(
+                asyncio.get_running_loop().sock_connect(self.socket, (self.robot_ip, self.state_port)),
+                timeout=3.0)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.connection_established = True
-            print(f"📊 Connected to state interface at {self.robot_ip}:{self.state_port}")
+            self.pose_offset = None
+            log.info("📊 Connected to state interface at %s:%s", self.robot_ip, self.state_port)
             return True
         except Exception as e:
-            print(f"⚠️  State interface connection failed: {e}")
+            log.warning("⚠️  State interface connection failed: %s", e)
             return False
     
-    def reading_thread_func(self):
-        """Background thread that continuously reads state packets with proper header handling"""
-        buffer = b''
+    async def read_loop(self):
+        """Background task that continuously reads state packets with proper header handling"""
+        loop = asyncio.get_running_loop()
+        buffer = self._rxbuf
+        read_pos = 0   # Start of the first unprocessed packet in buffer
+        write_pos = 0  # End of the received data in buffer
         
-        while self.running:
-            try:
-                # Read available data
+        try:
+            while self.running:
                 try:
-                    chunk = self.socket.recv(4096)
-                    if chunk:
-                        buffer += chunk
-                except BlockingIOError:
-                    # No data available yet
-                    time.sleep(0.001)
-                    continue
+                    # Suspend until data arrives, received straight into the fixed buffer
+                    n = await loop.sock_recv_into(self.socket, self._mv[write_pos:])
+                    if not n:
+                        log.warning("⚠️  State connection closed")
+                        break
+                    write_pos += n
                 
-                # Process complete packets from buffer
-                while len(buffer) >= 4:  # Need at least header
-                    # Extract packet size from header (4 bytes, big-endian)
-                    packet_size = struct.unpack('>I', buffer[0:4])[0]
+                    # Walk packet boundaries without decoding; only the newest
+                    # complete packet matters, so backlog costs one header read each
+                    newest = -1
+                    while write_pos - read_pos >= 4:  # Need at least header
+                        # Extract packet size from header (4 bytes, big-endian)
+                        packet_size = _HDR.unpack_from(buffer, read_pos)[0]
                     
-                    # Check if we have a complete packet
-                    if len(buffer) >= packet_size:
-                        # Extract the complete packet
-                        packet = buffer[0:packet_size]
-                        buffer = buffer[packet_size:]  # Remove processed packet
-                        
-                        # The TCP pose is at offset 444 in the DATA part
-                        # The packet has: [4-byte header][data...]
-                        # So TCP pose in full packet is at: 4 (header) + 444 = 448
-                        tcp_offset_in_packet = 4 + self.tcp_data_offset
-                        
-                        if packet_size >= tcp_offset_in_packet + 48:
+                        if packet_size < 4 or packet_size > len(buffer):
+                            # Garbage header, can never complete: drop everything and resync
+                            read_pos = write_pos
+                            newest = -1
+                            break
+                    
+                        # Check if we have a complete packet
+                        if write_pos - read_pos < packet_size:
+                            # Incomplete packet, wait for more data
+                            break
+                    
+                        newest = read_pos
+                        newest_size = packet_size
+                        read_pos += packet_size
+                
+                    if newest >= 0:
+                        # The layout is fixed per connection: find the pose once and reuse it
+                        # (a real-time packet has it at 4-byte header + 444 = 448)
+                        if self.pose_offset is None:
+                            self.pose_offset = self.find_pose_offset(buffer, newest, newest_size)
+                        tcp_offset_in_packet = self.pose_offset
+                    
+                        if tcp_offset_in_packet is not None and newest_size >= tcp_offset_in_packet + _POSE.size:
                             try:
                                 # Extract TCP pose (6 doubles: X, Y, Z, Rx, Ry, Rz)
-                                pose_data = struct.unpack('!6d', 
-                                    packet[tcp_offset_in_packet:tcp_offset_in_packet+48])
+                                pose_data = Pose._make(_POSE.unpack_from(buffer, newest + tcp_offset_in_packet))
                                 x, y, z, rx, ry, rz = pose_data
-                                
-                                # Sanity checks - updated for moving robot
-                                if (abs(x) < 2.0 and abs(y) < 2.0 and 0.0 < z < 2.0 and
-                                    abs(rx) < 10.0 and abs(ry) < 10.0 and abs(rz) < 10.0):
-                                    
-                                    pose = {'x': x, 'y': y, 'z': z, 'rx': rx, 'ry': ry, 'rz': rz}
-                                    with self.pose_lock:
-                                        old_pose = self.current_pose
-                                        self.current_pose = pose
-                                        
-                                        # Log when pose actually changes
-                                        if old_pose:
-                                            dx = abs(pose['x'] - old_pose['x'])
-                                            dy = abs(pose['y'] - old_pose['y'])
-                                            dz = abs(pose['z'] - old_pose['z'])
-                                            if dx > 0.001 or dy > 0.001 or dz > 0.001:
-                                                # Pose changed significantly
-                                                pass
                             
+                                # Sanity checks - updated for moving robot
+                                if (max(abs(x), abs(y)) < 2.0 and 0.0 < z < 2.0 and
+                                    max(abs(rx), abs(ry), abs(rz)) < 10.0):
+                                
+                                    # Publish (and wake waiters) only when the pose actually moved
+                                    if pose_data != self.current_pose:
+                                        self.current_pose = pose_data
+                                        self.pose_event.set()
+                                else:
+                                    # Layout changed under us (e.g. firmware mismatch): look again
+                                    self.pose_offset = None
+                        
                             except struct.error:
                                 # Malformed packet, skip
                                 pass
-                    else:
-                        # Incomplete packet, wait for more data
-                        break
                 
-            except ConnectionResetError:
-                print("⚠️  State connection reset")
-                break
-            except Exception as e:
-                # Suppress common errors to keep thread running
-                if "timed out" not in str(e):
-                    print(f"⚠️  Read error in state thread: {e}")
-                time.sleep(0.01)
+                    # Rewind when everything is consumed; otherwise move a partial
+                    # packet to the front once the buffer has no room left
+                    if read_pos == write_pos:
+                        read_pos = write_pos = 0
+                    elif write_pos == len(buffer):
+                        remaining = write_pos - read_pos
+                        buffer[:remaining] = buffer[read_pos:write_pos]
+                        read_pos, write_pos = 0, remaining
+                
+                except ConnectionResetError:
+                    log.warning("⚠️  State connection reset")
+                    break
+                except Exception as e:
+                    # Suppress common errors to keep the reader running
+                    # Can repeat every iteration on a flapping link: debug only
+                    log.debug("⚠️  Read error in state reader: %s", e)
+                    await asyncio.sleep(0.01)
+        finally:
+            log.info("📊 State reader stopped")
+    
+    def find_pose_offset(self, buffer, start, size):
+        """Locate the TCP pose in a packet (offset from packet start), or None"""
+        msg_type = buffer[start + 4]
+        if msg_type >= 0x30:
+            # Real-time interface (30003): flat layout with the pose at a fixed offset.
+            # Byte 4 there is the top byte of the timestamp double (0x3F-0x41 in
+            # practice), while primary/secondary message types are small integers
+            return 4 + self.tcp_data_offset
+        if msg_type != ROBOT_STATE_MESSAGE:
+            return None  # Version/text/... message, no pose in it
         
-        print("📊 State reading thread stopped")
+        # Primary/secondary interface: walk the sub-package table to Cartesian info
+        off = 5
+        while off + _SUBHDR.size <= size:
+            sub_len, sub_type = _SUBHDR.unpack_from(buffer, start + off)
+            if sub_type == CARTESIAN_INFO:
+                return off + _SUBHDR.size
+            if sub_len < _SUBHDR.size:
+                break
+            off += sub_len
+        return None
     
-    def start(self):
-        """Start the continuous reading thread"""
-        if not self.connect():
+    async def start(self):
+        """Start the continuous reading task"""
+        if not await self.connect():
             return False
         
-        # Set socket to non-blocking for the reading thread
-        self.socket.setblocking(False)
-        
         self.running = True
-        self.reading_thread = threading.Thread(target=self.reading_thread_func, daemon=True)
-        self.reading_thread.start()
+        self.reading_task = asyncio.create_task(self.read_loop())
         
-        # Wait for first reading
-        for i in range(30):  # Wait up to 3 seconds
-            if self.get_current_pose():
-                break
-            time.sleep(0.1)
+        # Wait for first reading (up to 3 seconds)
+        if self.current_pose is None:
+            await self.wait_for_update(timeout=3.0)
         
         return True
     
     def get_current_pose(self):
-        """Get the latest TCP pose (thread-safe)"""
-        with self.pose_lock:
-            return self.current_pose
+        """Get the latest TCP pose as a Pose (safe without locking)"""
+        return self.current_pose
+    
+    async def wait_for_update(self, timeout=0.1):
+        """Wait until the pose next changes (or timeout); returns False on timeout"""
+        self.pose_event.clear()
+        try:
+            await asyncio.wait_for(self.pose_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
-    def stop(self):
-        """Stop the reading thread"""
+    async def stop(self):
+        """Stop the reading task"""
         self.running = False
-        if self.reading_thread and self.reading_thread.is_alive():
-            self.reading_thread.join(timeout=1.0)
+        if self.reading_task:
+            self.reading_task.cancel()
+            try:
+                await self.reading_task
+            except asyncio.CancelledError:
+                pass
         if self.socket:
             self.socket.close()
 
@@ -163,19 +236,21 @@ class RobotController:
         self.ip = ip
         self.move_port = move_port
         self.state_port = state_port
-        self.move_socket = None
+        self.move_writer = None
         self.tcp_reader = None
         self.running = False
         
-    def connect(self):
+    async def connect(self):
         """Establish connections to robot"""
         print(f"🔌 Connecting to robot at {self.ip}...")
         
         # Connect to command interface
         try:
-            self.move_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.move_socket.settimeout(10)
-            self.move_socket.connect((self.ip, self.move_port))
+            _, self.move_writer = await asyncio.wait_for(
+                asyncio.open_connection(self.ip, self.move_port), timeout=10)
+            # Send short script commands immediately instead of waiting on Nagle
+            self.move_writer.get_extra_info('socket').setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             print(f"✅ Connected to command interface at {self.ip}:{self.move_port}")
         except Exception as e:
             print(f"❌ Command interface failed: {e}")
@@ -183,15 +258,15 @@ class RobotController:
         
         # Start continuous TCP reader with proper packet handling
         self.tcp_reader = ContinuousTCPReader(self.ip, self.state_port)
-        if self.tcp_reader.start():
+        if await self.tcp_reader.start():
             print("📊 Continuous TCP reader started (with proper packet handling)")
             
             # Display initial pose
             initial_pose = self.tcp_reader.get_current_pose()
             if initial_pose:
-                print(f"📊 Initial pose: X={initial_pose['x']*1000:.1f}mm, "
-                      f"Y={initial_pose['y']*1000:.1f}mm, "
-                      f"Z={initial_pose['z']*1000:.1f}mm")
+                print(f"📊 Initial pose: X={initial_pose.x*1000:.1f}mm, "
+                      f"Y={initial_pose.y*1000:.1f}mm, "
+                      f"Z={initial_pose.z*1000:.1f}mm")
             else:
                 print("⚠️  No initial pose received")
         else:
@@ -199,121 +274,158 @@ class RobotController:
         
         return True
     
-    def send_command(self, cmd, wait_time=0.1):
+    async def send_command(self, cmd, wait_time=0.1):
         """Send command to robot"""
-        if not self.move_socket:
+        return await self.send_bytes((cmd + "\n").encode(), wait_time)
+    
+    async def send_bytes(self, data, wait_time=0.1):
+        """Send already-encoded script text to robot"""
+        if not self.move_writer:
             return False
             
         try:
-            self.move_socket.sendall((cmd + "\n").encode())
-            time.sleep(wait_time)
+            self.move_writer.write(data)
+            await self.move_writer.drain()
+            if wait_time:
+                await asyncio.sleep(wait_time)
             return True
         except Exception as e:
             print(f"❌ Command failed: {e}")
             return False
     
+    async def send_program(self, lines):
+        """Send several script lines (bytes) as one program; the controller runs them in order"""
+        program = b"def robot_prog():\n  " + b"\n  ".join(lines) + b"\nend\n"
+        return await self.send_bytes(program, wait_time=0)
+    
+    def movel_command(self, target_pose):
+        """URScript movel line (bytes, no newline) for a Pose"""
+        return _MOVEL_FMT % (*target_pose, ACCELERATION, VELOCITY)
+    
     def get_current_tcp_pose(self):
         """Get current TCP pose from continuous reader"""
         if self.tcp_reader:
             return self.tcp_reader.get_current_pose()
         return None
     
-    def move_with_live_verification(self, target_pose, pose_name=""):
+    async def move_with_live_verification(self, target_pose, pose_name="", send=True):
         """
         Move with live TCP reading that should now update as robot moves
+        (send=False only monitors, for moves already queued with send_program)
         """
-        print(f"\n📍 {pose_name}")
-        print(f"  Target: X={target_pose['x']*1000:.1f}mm, "
-              f"Y={target_pose['y']*1000:.1f}mm, "
-              f"Z={target_pose['z']*1000:.1f}mm")
+        # Output is collected and written in one go per step, so printing never
+        # sits between a pose update and the check that reacts to it
+        out = [f"\n📍 {pose_name}\n",
+               f"  Target: X={target_pose.x*1000:.1f}mm, "
+               f"Y={target_pose.y*1000:.1f}mm, "
+               f"Z={target_pose.z*1000:.1f}mm\n"]
+        
+        # Target position as a tuple once, so distances below are a single math.dist
+        target_xyz = target_pose[:3]
         
         # Get starting pose
         start_pose = self.get_current_tcp_pose()
         if start_pose:
-            print(f"  Start:  X={start_pose['x']*1000:.1f}mm, "
-                  f"Y={start_pose['y']*1000:.1f}mm, "
-                  f"Z={start_pose['z']*1000:.1f}mm")
+            out.append(f"  Start:  X={start_pose.x*1000:.1f}mm, "
+                       f"Y={start_pose.y*1000:.1f}mm, "
+                       f"Z={start_pose.z*1000:.1f}mm\n")
             
             # Calculate expected distance
-            dx = target_pose['x'] - start_pose['x']
-            dy = target_pose['y'] - start_pose['y']
-            dz = target_pose['z'] - start_pose['z']
-            distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-            print(f"  Distance: {distance*1000:.1f}mm")
+            distance = math.dist(target_xyz, start_pose[:3])
+            out.append(f"  Distance: {distance*1000:.1f}mm\n")
         
         # Send movement command
-        cmd = f"movel(p[{target_pose['x']:.5f}, {target_pose['y']:.5f}, {target_pose['z']:.5f}, " \
-              f"{target_pose['rx']:.5f}, {target_pose['ry']:.5f}, {target_pose['rz']:.5f}], " \
-              f"a={ACCELERATION}, v={VELOCITY})"
-        
-        print(f"  📤 Sending movement command...")
-        
-        if not self.send_command(cmd, wait_time=0.1):
-            print(f"  ❌ Failed to send command")
-            return False
+        if send:
+            out.append(f"  📤 Sending movement command...\n")
+            
+            if not await self.send_bytes(self.movel_command(target_pose) + b"\n", wait_time=0.1):
+                out.append(f"  ❌ Failed to send command\n")
+                sys.stdout.write("".join(out))
+                return False
         
         # Monitor movement with live TCP reading
-        print(f"  👀 Monitoring movement with live TCP reading...")
+        out.append(f"  👀 Monitoring movement with live TCP reading...\n")
+        sys.stdout.write("".join(out))
         
-        start_time = time.time()
+        # Hoist everything the loop reads repeatedly into locals
+        tx, ty, tz = target_xyz
+        mono = time.monotonic
+        start_time = mono()
         timeout = 10.0  # Generous timeout
+        deadline = start_time + timeout
         last_pose = start_pose
         last_print = start_time
+        moved = False  # Pose changed since the last progress print
+        now = start_time
         
-        while time.time() - start_time < timeout:
+        while now < deadline:
             # Get current pose
             current_pose = self.get_current_tcp_pose()
             
             if current_pose:
+                cx = current_pose.x
+                cy = current_pose.y
+                cz = current_pose.z
+                
                 # Check if pose is updating
                 if last_pose:
-                    dx_change = abs(current_pose['x'] - last_pose['x'])
-                    dy_change = abs(current_pose['y'] - last_pose['y'])
-                    dz_change = abs(current_pose['z'] - last_pose['z'])
+                    dx_change = cx - last_pose.x
+                    dy_change = cy - last_pose.y
+                    dz_change = cz - last_pose.z
                     
-                    # If pose changed significantly, robot is moving
-                    if dx_change > 0.001 or dy_change > 0.001 or dz_change > 0.001:
-                        print(f"  ✅ TCP READING IS UPDATING! Robot is moving.")
-                        print(f"    Current: X={current_pose['x']*1000:.1f}mm, "
-                              f"Y={current_pose['y']*1000:.1f}mm, "
-                              f"Z={current_pose['z']*1000:.1f}mm")
+                    # If pose changed significantly (> 1mm on any axis), robot is moving
+                    if (dx_change * dx_change > 1e-6 or dy_change * dy_change > 1e-6 or
+                            dz_change * dz_change > 1e-6):
+                        moved = True
                 
                 last_pose = current_pose
                 
-                # Calculate distance to target
-                dx = target_pose['x'] - current_pose['x']
-                dy = target_pose['y'] - current_pose['y']
-                dz = target_pose['z'] - current_pose['z']
-                current_distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-                
-                # Print progress every 0.5 seconds
-                if time.time() - last_print > 0.5:
-                    print(f"    📍 Remaining: {current_distance*1000:.1f}mm")
-                    last_print = time.time()
+                # Squared distance to target (sqrt only when printing)
+                dx = tx - cx
+                dy = ty - cy
+                dz = tz - cz
+                d2 = dx * dx + dy * dy + dz * dz
                 
                 # Check if we've reached target
-                if current_distance < 0.005:  # 5mm tolerance
-                    elapsed = time.time() - start_time
-                    print(f"  ✅ Reached {pose_name} in {elapsed:.1f}s")
-                    print(f"    Final: X={current_pose['x']*1000:.1f}mm, "
-                          f"Y={current_pose['y']*1000:.1f}mm, "
-                          f"Z={current_pose['z']*1000:.1f}mm")
+                if d2 < 2.5e-5:  # 5mm tolerance, squared
+                    elapsed = now - start_time
+                    sys.stdout.write(f"  ✅ Reached {pose_name} in {elapsed:.1f}s\n"
+                                     f"    Final: X={cx*1000:.1f}mm, "
+                                     f"Y={cy*1000:.1f}mm, "
+                                     f"Z={cz*1000:.1f}mm\n")
                     return True
+                
+                # Print progress every 0.5 seconds
+                if now - last_print > 0.5:
+                    progress = ""
+                    if moved:
+                        progress = (f"  ✅ TCP READING IS UPDATING! Robot is moving.\n"
+                                    f"    Current: X={cx*1000:.1f}mm, "
+                                    f"Y={cy*1000:.1f}mm, "
+                                    f"Z={cz*1000:.1f}mm\n")
+                        moved = False
+                    sys.stdout.write(f"{progress}    📍 Remaining: {math.sqrt(d2)*1000:.1f}mm\n")
+                    last_print = now
             
-            time.sleep(0.05)  # 50ms polling
+            # Wake on the next pose update (one UR packet) instead of a 50ms poll
+            if self.tcp_reader:
+                await self.tcp_reader.wait_for_update(timeout=0.1)
+            else:
+                await asyncio.sleep(0.05)
+            now = mono()
         
         # Timeout reached
         final_pose = self.get_current_tcp_pose()
         if final_pose:
-            print(f"  ⚠️  Timeout. Final pose: X={final_pose['x']*1000:.1f}mm, "
-                  f"Y={final_pose['y']*1000:.1f}mm, "
-                  f"Z={final_pose['z']*1000:.1f}mm")
+            print(f"  ⚠️  Timeout. Final pose: X={final_pose.x*1000:.1f}mm, "
+                  f"Y={final_pose.y*1000:.1f}mm, "
+                  f"Z={final_pose.z*1000:.1f}mm")
         else:
             print(f"  ⚠️  Timeout. No TCP reading available.")
         
         return False
     
-    def test_tcp_reading_during_movement(self):
+    async def test_tcp_reading_during_movement(self):
         """Test TCP reading while robot moves"""
         print("\n" + "="*70)
         print("🎯 TESTING TCP READING DURING MOVEMENT")
@@ -329,15 +441,15 @@ class RobotController:
         for i in range(5):
             pose = self.get_current_tcp_pose()
             if pose:
-                print(f"  Reading {i+1}: X={pose['x']*1000:.1f}mm, "
-                      f"Y={pose['y']*1000:.1f}mm, Z={pose['z']*1000:.1f}mm")
+                print(f"  Reading {i+1}: X={pose.x*1000:.1f}mm, "
+                      f"Y={pose.y*1000:.1f}mm, Z={pose.z*1000:.1f}mm")
             else:
                 print(f"  Reading {i+1}: No pose data")
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
         
         # Now move to H1 with live monitoring
         print(f"\n🚀 Moving to H1 with live TCP monitoring...")
-        success = self.move_with_live_verification(H1, "H1")
+        success = await self.move_with_live_verification(H1, "H1")
         
         if success:
             print(f"\n✅ SUCCESS: TCP reading correctly tracked robot movement!")
@@ -347,8 +459,8 @@ class RobotController:
             # Check final pose
             final_pose = self.get_current_tcp_pose()
             if final_pose:
-                print(f"📊 Final TCP reading: X={final_pose['x']*1000:.1f}mm, "
-                      f"Y={final_pose['y']*1000:.1f}mm, Z={final_pose['z']*1000:.1f}mm")
+                print(f"📊 Final TCP reading: X={final_pose.x*1000:.1f}mm, "
+                      f"Y={final_pose.y*1000:.1f}mm, Z={final_pose.z*1000:.1f}mm")
             
             print(f"\n🔍 PROBLEM ANALYSIS:")
             print(f"  Robot IS moving (you can see it)")
@@ -357,9 +469,9 @@ class RobotController:
         
         return success
     
-    def run_complete_test(self):
+    async def run_complete_test(self):
         """Run complete test of TCP reading during movement"""
-        if not self.connect():
+        if not await self.connect():
             return
         
         print("\n" + "="*70)
@@ -374,28 +486,32 @@ class RobotController:
             for i in range(3):
                 pose = self.get_current_tcp_pose()
                 if pose:
-                    print(f"   Reading {i+1}: X={pose['x']*1000:.1f}mm, "
-                          f"Y={pose['y']*1000:.1f}mm, Z={pose['z']*1000:.1f}mm")
-                time.sleep(0.3)
+                    print(f"   Reading {i+1}: X={pose.x*1000:.1f}mm, "
+                          f"Y={pose.y*1000:.1f}mm, Z={pose.z*1000:.1f}mm")
+                await asyncio.sleep(0.3)
+            
+            # Send the whole route as one program; the controller sequences the
+            # moves itself and the steps below only monitor arrival at each corner
+            print("\n📤 Sending H1 → H8 → A8 → A1 as one program...")
+            if not await self.send_program([self.movel_command(p) for p in (H1, H8, A8, A1)]):
+                print("❌ Failed to send program")
+                return
             
             # Test 2: Move to H1 with monitoring
             print("\n2️⃣  Moving to H1 with TCP monitoring...")
-            self.move_with_live_verification(H1, "H1")
-            time.sleep(0.5)
+            await self.move_with_live_verification(H1, "H1", send=False)
             
             # Test 3: Move to H8
             print("\n3️⃣  Moving to H8 with TCP monitoring...")
-            self.move_with_live_verification(H8, "H8")
-            time.sleep(0.5)
+            await self.move_with_live_verification(H8, "H8", send=False)
             
             # Test 4: Move to A8
             print("\n4️⃣  Moving to A8 with TCP monitoring...")
-            self.move_with_live_verification(A8, "A8")
-            time.sleep(0.5)
+            await self.move_with_live_verification(A8, "A8", send=False)
             
             # Test 5: Return to A1
             print("\n5️⃣  Returning to A1 with TCP monitoring...")
-            self.move_with_live_verification(A1, "A1")
+            await self.move_with_live_verification(A1, "A1", send=False)
             
             print("\n" + "="*70)
             print("📊 TEST COMPLETE")
@@ -406,7 +522,8 @@ class RobotController:
             print("  ❌ TCP reader still has packet sync issues")
             print("="*70)
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Ctrl+C under asyncio.run() arrives as a cancellation of this task
             print("\n\n⚠️  Keyboard interrupt!")
             self.running = False
         except Exception as e:
@@ -418,33 +535,34 @@ class RobotController:
             print("🧹 CLEANING UP...")
             
             try:
-                self.send_command("stopl(2.0)")
-                time.sleep(0.5)
+                await self.send_command("stopl(2.0)")
+                await asyncio.sleep(0.5)
             except:
                 pass
             
             if self.tcp_reader:
-                self.tcp_reader.stop()
+                await self.tcp_reader.stop()
             
-            if self.move_socket:
-                self.move_socket.close()
+            if self.move_writer:
+                self.move_writer.close()
                 print("✅ Disconnected")
             
             print("\n👋 TEST COMPLETE")
             print("="*70)
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("="*70)
     print("🔧 FIXED TCP READER TEST - WITH PROPER PACKET HANDLING")
     print("="*70)
     print("Key fix: Properly handles UR packet structure:")
     print("  • 4-byte header containing packet size")
     print("  • TCP pose at offset 444 in DATA part (448 in full packet)")
-    print("  • Non-blocking continuous reading")
+    print("  • asyncio reading into a fixed buffer")
     print("="*70)
     
     controller = RobotController(ROBOT_IP, MOVE_PORT, STATE_PORT)
-    controller.run_complete_test()
+    asyncio.run(controller.run_complete_test())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
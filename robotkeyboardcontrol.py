@@ -4,11 +4,21 @@ import threading
 import struct
 import json
 import os
+import queue
+from collections import namedtuple
 from pynput import keyboard
 
+# orjson parses several times faster than the stdlib and also reuses the repeated
+# "x"/"y"/"z"/... key strings across pose dicts; it stays optional
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # ================== CONFIG ==================
 ROBOT_IP = "192.168.1.20"
 PORT = 30002
+STATE_PORT = 30003        # Real-time interface, used to see when a pose move has finished
 
 # Gripper config
 GRIPPER_IP = "192.168.1.1"
@@ -24,25 +34,52 @@ MAX_ROT_SPEED = 0.3       # rad/s
 ACCELERATION = 0.2
 SPEEDL_TIME = 10.0
 LOOP_RATE = 0.02
+SPEEDL_MIN_INTERVAL_NS = 50_000_000  # 50 ms; near-identical speedl updates inside this are dropped
+SPEEDL_COALESCE_EPS = 0.01           # per-axis change below which an update counts as near-identical
+STOPL_CMD = b"stopl(0.5)\n"
+HELLO_CMD = b'textmsg("Keyboard jog connected")\n'
+# speedl line as one bytes template; only the six speeds are filled in per send
+SPEEDL_FMT = b"speedl([%.4f,%.4f,%.4f,%.4f,%.4f,%.4f]," + f"a={ACCELERATION},t={SPEEDL_TIME})\n".encode()
+
+# Socket options applied to every robot/gripper connection: (level, option, value).
+# Script lines and Modbus frames are tiny complete messages, so Nagle only adds delay
+DEFAULT_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+# The gripper link idles between commands: keepalive probes notice a dead Compute Box
+# (or a NAT/switch that dropped the flow) before the next command has to
+GRIPPER_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, 'TCP_KEEPIDLE'):
+    GRIPPER_KEEPALIVE_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+if hasattr(socket, 'TCP_KEEPINTVL'):
+    GRIPPER_KEEPALIVE_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5))
 
 # Pose movement parameters - SIMPLIFIED
 POSE_ACCELERATION = 0.3
 POSE_VELOCITY = 0.15
-POSE_WAIT_TIME = 3.0      # Wait 5 seconds after sending move command
+POSE_WAIT_TIME = 3.0      # Fixed wait after a move command when the state interface is unavailable
+POSE_MOVE_TIMEOUT = 20.0  # Upper bound on a pose move when watching the state interface
 # ============================================
 
 velocity = [0, 0, 0, 0, 0, 0]
 last_sent_velocity = [0, 0, 0, 0, 0, 0]
 vel_lock = threading.Lock()
 running = True
-gripper_busy = False
-gripper_lock = threading.Lock()
+
+# Key presses hand gripper commands and pose moves to one long-lived worker each.
+# The pending sets hold what is queued but not yet taken, so key autorepeat doesn't
+# queue the same command twice
+gripper_queue = queue.Queue(maxsize=4)
+pose_queue = queue.Queue(maxsize=1)  # One pose move at a time
+gripper_pending = set()
+pose_pending = set()
+pending_lock = threading.Lock()
 
 # State variables for pose movement
 pose_moving = False
 cancel_pose_move = False
 current_pose_target = None
 poses = {}
+pose_commands = {}  # Pose name -> encoded script for that move, built by load_poses()
 
 # ================= KEY MAP ==================
 KEY_MAP = {
@@ -62,8 +99,42 @@ KEY_MAP = {
     # Optional: add home and drop poses if they exist in JSON
     '7': 'home', '8': 'drop',
 }
+
+# KEY_MAP split by action kind once at import, so a key press is one dict hit
+# with a known value type instead of isinstance/string checks
+AXIS_MAP = {}     # key -> (axis, direction)
+GRIPPER_MAP = {}  # key -> 'close' / 'open' / 'stop'
+POSE_MAP = {}     # key -> pose name
+POSE_TARGETS = {}  # key -> (pose name, section in the poses file, index into corners)
+for _key, _action in KEY_MAP.items():
+    if isinstance(_action, tuple):
+        AXIS_MAP[_key] = _action
+    elif _action in ('close', 'open', 'stop'):
+        GRIPPER_MAP[_key] = _action
+    elif _action.startswith('pose'):
+        POSE_MAP[_key] = _action
+        POSE_TARGETS[_key] = (f'corner{_action[4:]}', 'corners', int(_action[4:]) - 1)
+    elif _action in ('home', 'drop'):
+        POSE_MAP[_key] = _action
+        POSE_TARGETS[_key] = (_action, _action, 0)
 # ============================================
 
+# Poses are flat (x, y, z, rx, ry, rz) tuples once loaded
+Pose = namedtuple('Pose', 'x y z rx ry rz')
+POSE_MOVEL_FMT = (b"movel(p[%.5f, %.5f, %.5f, %.5f, %.5f, %.5f], "
+                  + f"a={POSE_ACCELERATION}, v={POSE_VELOCITY})\n".encode())
+
+def to_pose(entry):
+    """Pose tuple from a JSON pose dict"""
+    return Pose(entry['x'], entry['y'], entry['z'], entry['rx'], entry['ry'], entry['rz'])
+
+def build_pose_command(pose, pose_name=""):
+    """Encoded textmsg + movel lines for a pose (formatted once, sent as-is)"""
+    cmd = POSE_MOVEL_FMT % pose
+    if pose_name:
+        cmd = f'textmsg("Moving to {pose_name}")\n'.encode() + cmd
+    return cmd
+
 def load_poses():
     """Load poses from JSON file"""
     global poses
@@ -73,15 +144,28 @@ def load_poses():
         return False
     
     try:
-        with open(POSE_FILE_PATH, 'r') as f:
-            poses = json.load(f)
+        with open(POSE_FILE_PATH, 'rb') as f:
+            poses = _json_loads(f.read())
+        if 'corners' in poses:
+            poses['corners'] = [to_pose(corner) for corner in poses['corners']]
+        for name in ('home', 'drop'):
+            if name in poses:
+                poses[name] = to_pose(poses[name])
         print(f"✓ Loaded poses from {POSE_FILE_PATH}")
         
+        # Poses don't change after loading: format their move commands now
+        pose_commands.clear()
+        for i, corner in enumerate(poses.get('corners', [])):
+            pose_commands[f'corner{i+1}'] = build_pose_command(corner, f'corner{i+1}')
+        for name in ('home', 'drop'):
+            if name in poses:
+                pose_commands[name] = build_pose_command(poses[name], name)
+        
         # List available poses
         if 'corners' in poses:
             print(f"  - {len(poses['corners'])} corners available")
             for i, corner in enumerate(poses['corners']):
-                print(f"    {i+1}: [{corner['x']:.3f}, {corner['y']:.3f}, {corner['z']:.3f}]")
+                print(f"    {i+1}: [{corner.x:.3f}, {corner.y:.3f}, {corner.z:.3f}]")
         if 'home' in poses:
             print("  - Home pose available")
         if 'drop' in poses:
@@ -92,27 +176,47 @@ def load_poses():
         print(f"✗ Error loading poses: {e}")
         return False
 
+# Modbus TCP / real-time interface layouts, compiled once
+_MBAP = struct.Struct('>HHHB')       # Transaction ID, Protocol ID, Length, Unit ID
+_RW_PDU = struct.Struct('>BHH')      # FC 0x03 / 0x06: Function Code, Address, Quantity or Value
+_WRITE_MULTI_PDU = struct.Struct('>BHHB')  # FC 0x10: Function Code, Address, Quantity, Byte Count
+_UR_PACKET_SIZE = struct.Struct('>I')  # Real-time interface (port 30003): 4-byte message size
+_JOINT_SPEEDS = struct.Struct('>6d')
+_DOUBLE = struct.Struct('>d')
+
 class SimpleGripperControl:
     """Direct TCP Modbus communication for OnRobot 2FG7 Gripper"""
     
-    def __init__(self, ip=GRIPPER_IP, port=GRIPPER_PORT, unit_id=GRIPPER_UNIT_ID):
+    def __init__(self, ip=GRIPPER_IP, port=GRIPPER_PORT, unit_id=GRIPPER_UNIT_ID,
+                 socket_options=None):
         self.ip = ip
         self.port = port
         self.unit_id = unit_id
+        # Extra (level, option, value) tuples, e.g. SO_KEEPALIVE, on top of the defaults
+        self.socket_options = (DEFAULT_SOCKET_OPTIONS + GRIPPER_KEEPALIVE_OPTIONS
+                               + list(socket_options or []))
         self.sock = None
         self.transaction_id = 1
         self.connected = False
         self.last_command = None
+        self._limits_cache = None        # (min_mm, max_mm) - fixed per gripper
+        self._product_code_cache = None
+        self._rxbuf = bytearray(260)  # Max Modbus TCP ADU: 7-byte MBAP header + 253-byte PDU
         
     def connect(self):
         """Establish connection to Compute Box"""
         try:
             if self.sock:
                 self.sock.close()
+            self._limits_cache = None
+            self._product_code_cache = None
             
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            for option in self.socket_options:
+                self.sock.setsockopt(*option)
             self.sock.settimeout(2.0)
             self.sock.connect((self.ip, self.port))
+            self.transaction_id = 1  # Transaction IDs are per connection
             self.connected = True
             print(f"✓ Gripper connected to {self.ip}:{self.port}")
             return True
@@ -135,65 +239,94 @@ class SimpleGripperControl:
             return None
             
         try:
-            # Increment transaction ID
-            transaction_id = self.transaction_id
-            self.transaction_id = (self.transaction_id + 1) % 65536
-            
-            # Build MBAP header
-            length = len(data) + 1  # +1 for unit_id
-            mbap_header = struct.pack('>HHHB', 
-                                     transaction_id, 
-                                     0,           # Protocol ID = 0 for Modbus
-                                     length, 
-                                     self.unit_id)
-            
-            # Build complete frame
-            frame = mbap_header + data
-            
-            # Send request
-            self.sock.sendall(frame)
-            
-            # Receive response header (7 bytes)
-            header = self.sock.recv(7)
-            if len(header) != 7:
+            return self._exchange(function_code, data)
+        except OSError as e:
+            # Dropped connection (reset, timeout, closed by the box): reconnect
+            # once and resend the same request instead of failing the command
+            print(f"⚠️  Gripper connection lost ({e or type(e).__name__}), reconnecting...")
+            if not self.connect():
                 return None
-            
-            # Parse response header
-            resp_trans_id, resp_proto_id, resp_length, resp_unit_id = struct.unpack('>HHHB', header)
-            
-            # Receive remaining data
-            data_len = resp_length - 1  # Subtract unit_id byte
-            if data_len > 0:
-                response_data = self.sock.recv(data_len)
-                if len(response_data) != data_len:
-                    return None
-            else:
-                response_data = b''
-            
-            # Check if it's an exception response
-            if response_data[0] == function_code + 0x80:
-                return None
-            
-            return response_data
-            
         except Exception:
             self.connected = False
             return None
+        
+        try:
+            return self._exchange(function_code, data)
+        except Exception:
+            self.connected = False
+            return None
+    
+    def _exchange(self, function_code, data):
+        """One request/response round trip; raises OSError if the connection is gone"""
+        # Increment transaction ID
+        transaction_id = self.transaction_id
+        self.transaction_id = (self.transaction_id + 1) % 65536
+        
+        # Build MBAP header
+        length = len(data) + 1  # +1 for unit_id
+        mbap_header = _MBAP.pack(transaction_id, 
+                                 0,           # Protocol ID = 0 for Modbus
+                                 length, 
+                                 self.unit_id)
+        
+        # Build complete frame
+        frame = mbap_header + data
+        
+        # Send request
+        self.sock.sendall(frame)
+        if hasattr(socket, 'TCP_QUICKACK'):
+            # Linux: ACK the reply right away instead of delaying it
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        
+        # Receive response header (7 bytes), then the rest of the frame it announces
+        rxbuf = self._rxbuf
+        self._recv_exact(7, rxbuf, 0)
+        
+        # Parse response header
+        resp_trans_id, resp_proto_id, resp_length, resp_unit_id = _MBAP.unpack_from(rxbuf, 0)
+        
+        # Receive remaining data
+        data_len = resp_length - 1  # Subtract unit_id byte
+        if data_len < 1 or 7 + data_len > len(rxbuf):
+            return None
+        self._recv_exact(7 + data_len, rxbuf, 7)
+        response_data = bytes(rxbuf[7:7 + data_len])
+        
+        # Check if it's an exception response
+        if response_data[0] == function_code + 0x80:
+            return None
+        
+        return response_data
+    
+    def _recv_exact(self, n, out, off):
+        """Fill out[off:n] from the socket; TCP may hand the frame over in pieces"""
+        view = memoryview(out)
+        while off < n:
+            nread = self.sock.recv_into(view[off:n])
+            if not nread:
+                raise ConnectionResetError("closed by Compute Box")
+            off += nread
     
     def read_holding_register(self, address):
         """Read a single holding register (Function Code 0x03)"""
+        values = self.read_holding_registers(address, 1)
+        if values is not None:
+            return values[0]
+        return None
+    
+    def read_holding_registers(self, address, count):
+        """Read consecutive holding registers in one request (Function Code 0x03)"""
         if not self.connected:
             return None
             
         # Build PDU: Function Code (1), Address (2), Quantity (2)
-        pdu = struct.pack('>BHH', 0x03, address, 1)
+        pdu = _RW_PDU.pack(0x03, address, count)
         
         response = self._send_modbus_request(0x03, pdu)
-        if response and len(response) >= 3:
+        if response and len(response) >= 2 + 2 * count:
             # Response format: FC (1), Byte Count (1), Data (2*N)
-            if response[0] == 0x03 and response[1] == 2:
-                value = struct.unpack('>H', response[2:4])[0]
-                return value
+            if response[0] == 0x03 and response[1] == 2 * count:
+                return struct.unpack_from(f'>{count}H', response, 2)
         
         return None
     
@@ -203,7 +336,7 @@ class SimpleGripperControl:
             return False
             
         # Build PDU: Function Code (1), Address (2), Value (2)
-        pdu = struct.pack('>BHH', 0x06, address, value)
+        pdu = _RW_PDU.pack(0x06, address, value)
         
         response = self._send_modbus_request(0x06, pdu)
         if response and len(response) >= 5:
@@ -213,6 +346,24 @@ class SimpleGripperControl:
         
         return False
     
+    def write_multiple_registers(self, start_address, values):
+        """Write consecutive registers in one request (Function Code 0x10)"""
+        if not self.connected:
+            return False
+            
+        # Build PDU: Function Code (1), Address (2), Quantity (2), Byte Count (1), Values (2*N)
+        count = len(values)
+        pdu = (_WRITE_MULTI_PDU.pack(0x10, start_address, count, count * 2) +
+               struct.pack(f'>{count}H', *values))
+        
+        response = self._send_modbus_request(0x10, pdu)
+        if response and len(response) >= 5:
+            # Response echoes Function Code, Address and Quantity
+            if response[0] == 0x10:
+                return True
+        
+        return False
+    
     def get_current_width(self):
         """Get current external width in mm"""
         value = self.read_holding_register(257)  # 0x0101 External width
@@ -220,13 +371,24 @@ class SimpleGripperControl:
             return value / 10.0  # Convert from 1/10 mm to mm
         return None
     
+    def get_product_info(self):
+        """Read product code to identify the gripper (cached until reconnect)"""
+        if self._product_code_cache is None:
+            self._product_code_cache = self.read_holding_register(1536)
+        return self._product_code_cache
+    
     def get_limits(self):
-        """Get min and max width in mm"""
-        min_val = self.read_holding_register(259)  # 0x0103 Min external width
-        max_val = self.read_holding_register(260)  # 0x0104 Max external width
+        """Get min and max width in mm (cached until reconnect)"""
+        if self._limits_cache is not None:
+            return self._limits_cache
         
-        if min_val is not None and max_val is not None:
-            return min_val/10.0, max_val/10.0  # Convert to mm
+        # 0x0103 Min external width, 0x0104 Max external width: one request
+        values = self.read_holding_registers(259, 2)
+        
+        if values is not None:
+            min_val, max_val = values
+            self._limits_cache = (min_val/10.0, max_val/10.0)  # Convert to mm
+            return self._limits_cache
         return None, None
     
     def get_status(self):
@@ -249,16 +411,14 @@ class SimpleGripperControl:
         # Convert width to 1/10 mm
         width_units = int(width_mm * 10)
         
-        # Set parameters with error checking
-        success = True
-        if not self.write_single_register(0, width_units):    # Target width
-            success = False
-        if not self.write_single_register(1, force_n):        # Target force
-            success = False
-        if not self.write_single_register(2, speed_percent):  # Target speed
-            success = False
-        
-        return success
+        # Target width, force and speed are registers 0-2: one request
+        return self.write_multiple_registers(0, [width_units, force_n, speed_percent])
+    
+    def grip(self, width_mm, force_n=20, speed_percent=50, command=1):
+        """Set parameters and issue the command (register 3) in a single request"""
+        if not self.connected:
+            return False
+        return self.write_multiple_registers(0, [int(width_mm * 10), force_n, speed_percent, command])
     
     def execute_command(self, command):
         """Execute gripper command (1=grip external, 2=grip internal, 3=stop)"""
@@ -273,13 +433,11 @@ class SimpleGripperControl:
             print("✗ Could not read max width")
             return False
         
-        # Set parameters
-        if self.set_gripper_parameters(max_width, force_n, speed_percent):
-            time.sleep(0.1)  # Small delay
-            if self.execute_command(1):  # Grip external command
-                self.last_command = 'open'
-                print(f"✓ Opening to {max_width}mm")
-                return True
+        # Set parameters and grip external command together
+        if self.grip(max_width, force_n, speed_percent):
+            self.last_command = 'open'
+            print(f"✓ Opening to {max_width}mm")
+            return True
         
         print("✗ Failed to open gripper")
         return False
@@ -291,13 +449,11 @@ class SimpleGripperControl:
             print("✗ Could not read min width")
             return False
         
-        # Set parameters
-        if self.set_gripper_parameters(min_width, force_n, speed_percent):
-            time.sleep(0.1)  # Small delay
-            if self.execute_command(1):  # Grip external command
-                self.last_command = 'close'
-                print(f"✓ Closing to {min_width}mm")
-                return True
+        # Set parameters and grip external command together
+        if self.grip(min_width, force_n, speed_percent):
+            self.last_command = 'close'
+            print(f"✓ Closing to {min_width}mm")
+            return True
         
         print("✗ Failed to close gripper")
         return False
@@ -312,138 +468,308 @@ class SimpleGripperControl:
         return result
 
 def velocities_equal(v1, v2, eps=1e-4):
+    # Keys set exact values, so an unchanged velocity is usually an exact match:
+    # one C-level list compare instead of six Python-level subtractions
+    if v1 == v2:
+        return True
     return all(abs(a - b) < eps for a, b in zip(v1, v2))
 
 
+class URStateMonitor:
+    """Tracks program/motion state from the UR real-time interface (port 30003)"""
+    
+    QD_ACTUAL_OFFSET = 300      # Actual joint speeds, 6 doubles (rad/s)
+    PROGRAM_STATE_OFFSET = 1052  # Program state double; 2.0 = running
+    PROGRAM_RUNNING = 2.0
+    JOINT_STEADY_SPEED = 0.001  # rad/s; below this on every joint the arm counts as still
+    MOVE_START_TIMEOUT = 0.5    # A move that hasn't started by now is treated as already there
+    POLL_INTERVAL = 0.01
+    
+    def __init__(self, ip, port=STATE_PORT, socket_options=None):
+        self.ip = ip
+        self.port = port
+        self.socket_options = DEFAULT_SOCKET_OPTIONS + list(socket_options or [])
+        self.sock = None
+        self.active = False
+        # (packets seen, program running, joints moving); replaced as a whole by the reader
+        self.state = (0, False, False)
+        self._buf = bytearray(8192)
+    
+    def start(self):
+        """Connect and start the reader thread; False if the interface is unavailable"""
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            for option in self.socket_options:
+                self.sock.setsockopt(*option)
+            self.sock.settimeout(2.0)
+            self.sock.connect((self.ip, self.port))
+            self.sock.settimeout(0.5)
+        except Exception as e:
+            print(f"⚠️  State interface unavailable ({e}) - pose moves use a fixed {POSE_WAIT_TIME}s wait")
+            self.sock = None
+            return False
+        
+        self.active = True
+        threading.Thread(target=self._run, daemon=True).start()
+        print(f"✓ State interface connected on port {self.port}")
+        return True
+    
+    def stop(self):
+        self.active = False
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+    
+    def _run(self):
+        """Reader thread: keep the state of the newest complete packet"""
+        buf = self._buf
+        length = 0
+        while self.active:
+            try:
+                nread = self.sock.recv_into(memoryview(buf)[length:])
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.active:
+                    print(f"⚠️  State stream error: {e}")
+                break
+            if not nread:
+                print("⚠️  State connection closed by robot")
+                break
+            length += nread
+            
+            sequence, running, moving = self.state
+            offset = 0
+            while length - offset >= 4:
+                packet_size = _UR_PACKET_SIZE.unpack_from(buf, offset)[0]
+                if packet_size < 4 or packet_size > len(buf):
+                    print(f"⚠️  Bad state packet size {packet_size}, state stream stopped")
+                    self.active = False
+                    return
+                if length - offset < packet_size:
+                    break  # Rest of the packet is still on the wire
+                
+                moving = False
+                if packet_size >= self.QD_ACTUAL_OFFSET + 48:
+                    speeds = _JOINT_SPEEDS.unpack_from(buf, offset + self.QD_ACTUAL_OFFSET)
+                    moving = max(abs(qd) for qd in speeds) > self.JOINT_STEADY_SPEED
+                running = False
+                if packet_size >= self.PROGRAM_STATE_OFFSET + 8:
+                    running = _DOUBLE.unpack_from(buf, offset + self.PROGRAM_STATE_OFFSET)[0] \
+                        == self.PROGRAM_RUNNING
+                sequence += 1
+                offset += packet_size
+            
+            if offset:
+                remaining = length - offset
+                if remaining:
+                    buf[:remaining] = buf[offset:length]
+                length = remaining
+                self.state = (sequence, running, moving)
+        self.active = False
+    
+    def wait_for_move(self, timeout, cancelled=lambda: False):
+        """
+        Wait until the move just sent has started and finished.
+        Returns True when done, False on timeout or cancel, None if the stream went away.
+        """
+        sent_seq = self.state[0]
+        start = time.monotonic()
+        started = False
+        while self.active:
+            if cancelled():
+                return False
+            time.sleep(self.POLL_INTERVAL)
+            elapsed = time.monotonic() - start
+            if elapsed > timeout:
+                return False  # Checked first: a stalled stream never sends the packet waited on
+            sequence, running, moving = self.state
+            if sequence == sent_seq:
+                continue  # No packet since the command went out yet
+            
+            if running or moving:
+                started = True
+            elif started or elapsed > self.MOVE_START_TIMEOUT:
+                return True
+        return None
+
+
 class URJogController:
-    def __init__(self, ip, port):
+    def __init__(self, ip, port, socket_options=None, state_port=STATE_PORT):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        for option in DEFAULT_SOCKET_OPTIONS + list(socket_options or []):
+            self.sock.setsockopt(*option)
         self.sock.connect((ip, port))
-        self.sock.sendall(b'textmsg("Keyboard jog connected")\n')
+        self.sock.sendall(HELLO_CMD)
+        
+        # Move completion feedback; without it pose moves fall back to a fixed wait
+        self.state_monitor = URStateMonitor(ip, state_port, socket_options)
+        self.state_monitor.start()
         
     def send(self, cmd):
-        """Send command to robot"""
-        self.sock.sendall((cmd + "\n").encode())
+        """Send command to robot; prebuilt bytes lines (e.g. STOPL_CMD) go out as-is"""
+        if isinstance(cmd, (bytes, bytearray)):
+            self.sock.sendall(cmd)
+        else:
+            self.sock.sendall((cmd + "\n").encode())
         
     def send_movel(self, pose, pose_name=""):
         """Send movel command to specific pose"""
-        cmd = (f"movel(p[{pose['x']:.5f}, {pose['y']:.5f}, {pose['z']:.5f}, "
-               f"{pose['rx']:.5f}, {pose['ry']:.5f}, {pose['rz']:.5f}], "
-               f"a={POSE_ACCELERATION}, v={POSE_VELOCITY})")
-        
-        if pose_name:
-            self.send(f'textmsg("Moving to {pose_name}")')
-        self.send(cmd)
+        cmd = pose_commands.get(pose_name) if pose_name else None
+        if cmd is None:
+            cmd = build_pose_command(pose, pose_name)
+        self.sock.sendall(cmd)
         
     def move_to_pose(self, pose, pose_name=""):
-        """Send move command and wait fixed time"""
-        global pose_moving, cancel_pose_move
-        
+        """Send move command and wait until the robot reports it finished"""
         if pose_name:
             print(f"➡️  Moving to {pose_name}...")
         
-        pose_moving = True
-        cancel_pose_move = False
+        # pose_moving/cancel_pose_move are set when the key is queued and reset by pose_worker
         
         # Send the movement command
         self.send_movel(pose, pose_name)
         
-        # SIMPLE APPROACH: Just wait 5 seconds
-        # The robot will reach the position and stop automatically
-        wait_time = POSE_WAIT_TIME
-        step = 0.1  # Check for cancellation every 0.1 seconds
+        # Wait for the state interface to show the move started and stopped;
+        # movement keys cancel the wait either way
+        start = time.monotonic()
+        finished = None
+        if self.state_monitor.active:
+            finished = self.state_monitor.wait_for_move(POSE_MOVE_TIMEOUT, lambda: cancel_pose_move)
         
-        for i in range(int(wait_time / step)):
-            if cancel_pose_move:
-                print(f"⚠️  {pose_name} movement cancelled!")
-                self.send("stopl(0.5)")
-                break
-            time.sleep(step)
-        else:
-            if not cancel_pose_move:
-                print(f"✓ {pose_name} movement complete (waited {POSE_WAIT_TIME}s)")
+        if finished is None:
+            # No state stream: just wait, the robot will reach the position and stop
+            step = 0.1  # Check for cancellation every 0.1 seconds
+            for i in range(int(POSE_WAIT_TIME / step)):
+                if cancel_pose_move:
+                    break
+                time.sleep(step)
+            finished = not cancel_pose_move
         
-        pose_moving = False
-        cancel_pose_move = False
+        if cancel_pose_move:
+            print(f"⚠️  {pose_name} movement cancelled!")
+            self.sock.sendall(STOPL_CMD)
+        elif finished:
+            print(f"✓ {pose_name} movement complete ({time.monotonic() - start:.1f}s)")
+        else:
+            print(f"⚠️  {pose_name} movement did not finish within {POSE_MOVE_TIMEOUT:.0f}s")
         
     def loop(self):
         """Main control loop for continuous velocity control"""
         global last_sent_velocity, pose_moving
         
+        last_send_ns = 0
+        next_tick = time.monotonic()
         while running:
+            # Tick on a fixed schedule, so time spent sending doesn't stretch the period
+            next_tick += LOOP_RATE
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()  # Fell behind: resync instead of bursting
+            
             # If we're in the middle of a pose move, skip velocity control
             if pose_moving:
-                time.sleep(LOOP_RATE)
                 continue
                 
             with vel_lock:
                 v = velocity.copy()
 
             if not velocities_equal(v, last_sent_velocity):
-                if any(abs(x) > 1e-4 for x in v):
-                    cmd = (
-                        f"speedl([{v[0]:.4f},{v[1]:.4f},{v[2]:.4f},"
-                        f"{v[3]:.4f},{v[4]:.4f},{v[5]:.4f}],"
-                        f"a={ACCELERATION},t={SPEEDL_TIME})"
-                    )
+                now_ns = time.monotonic_ns()
+                moving = any(abs(x) > 1e-4 for x in v)
+                # Under key autorepeat, skip a small change right after a send; the
+                # running speedl keeps going and the change goes out next time round
+                if (moving and now_ns - last_send_ns < SPEEDL_MIN_INTERVAL_NS
+                        and velocities_equal(v, last_sent_velocity, SPEEDL_COALESCE_EPS)):
+                    continue
+
+                if moving:
+                    cmd = SPEEDL_FMT % tuple(v)
                 else:
-                    cmd = "stopl(0.5)"
+                    cmd = STOPL_CMD
 
-                self.send(cmd)
+                self.sock.sendall(cmd)
                 last_sent_velocity = v
+                last_send_ns = now_ns
 
-            time.sleep(LOOP_RATE)
-
-        self.send("stopl(0.5)")
+        self.sock.sendall(STOPL_CMD)
+        self.state_monitor.stop()
         self.sock.close()
 
 
-def gripper_command_thread(command_type, gripper):
-    """Thread function for gripper commands"""
-    global gripper_busy
-    
-    with gripper_lock:
-        if gripper_busy:
-            print(f"⚠ Gripper is busy. Ignoring {command_type} command.")
-            return
-        
-        gripper_busy = True
-    
+def queue_command(command_queue, pending, item):
+    """Hand item to a worker; None if it's already waiting, False if the queue is full"""
+    with pending_lock:
+        if item in pending:
+            return None  # Key autorepeat: the pending command covers this press too
+        try:
+            command_queue.put_nowait(item)
+        except queue.Full:
+            return False
+        pending.add(item)
+        return True
+
+
+def take_command(command_queue, pending):
+    """Next queued item for a worker, or None if nothing arrived within 0.1s"""
     try:
-        if command_type == 'open':
-            gripper.full_open()
-        elif command_type == 'close':
-            gripper.full_close()
-        elif command_type == 'stop':
-            gripper.stop()
-    except Exception as e:
-        print(f"✗ Gripper error during {command_type}: {e}")
-    finally:
-        with gripper_lock:
-            gripper_busy = False
+        item = command_queue.get(timeout=0.1)
+    except queue.Empty:
+        return None
+    with pending_lock:
+        pending.discard(item)
+    return item
 
 
-def pose_move_thread(pose_key, controller):
-    """Thread function for pose movement"""
+def gripper_worker(gripper):
+    """Run queued gripper commands one at a time"""
+    while running:
+        command_type = take_command(gripper_queue, gripper_pending)
+        if command_type is None:
+            continue
+        
+        try:
+            if command_type == 'open':
+                gripper.full_open()
+            elif command_type == 'close':
+                gripper.full_close()
+            elif command_type == 'stop':
+                gripper.stop()
+        except Exception as e:
+            print(f"✗ Gripper error during {command_type}: {e}")
+
+
+def pose_worker(controller):
+    """Run queued pose moves one at a time"""
+    global pose_moving, cancel_pose_move, current_pose_target
+    while running:
+        pose_key = take_command(pose_queue, pose_pending)
+        if pose_key is None:
+            continue
+        try:
+            pose_move(pose_key, controller)
+        finally:
+            # Also covers a move that bailed out early, so velocity control resumes
+            current_pose_target = None
+            cancel_pose_move = False
+            pose_moving = False
+
+
+def pose_move(pose_key, controller):
+    """Move to the pose bound to pose_key"""
     global pose_moving, cancel_pose_move, poses
     
-    # Map key to pose
-    pose_mapping = {
-        '1': ('corner1', 'corners', 0),
-        '2': ('corner2', 'corners', 1),
-        '3': ('corner3', 'corners', 2),
-        '4': ('corner4', 'corners', 3),
-        '5': ('corner5', 'corners', 4),
-        '6': ('corner6', 'corners', 5),
-        '7': ('home', 'home', 0),
-        '8': ('drop', 'drop', 0),
-    }
-    
-    if pose_key not in pose_mapping:
+    if pose_key not in POSE_TARGETS:
         print(f"❌ Unknown pose key: {pose_key}")
         return
     
-    pose_name, pose_type, index = pose_mapping[pose_key]
+    pose_name, pose_type, index = POSE_TARGETS[pose_key]
+    
+    if cancel_pose_move:
+        print(f"⚠️  {pose_name} movement cancelled before it started")
+        return
     
     # Get the pose from loaded poses
     if pose_type == 'corners':
@@ -462,50 +788,46 @@ def pose_move_thread(pose_key, controller):
 
 
 def on_press(key, gripper, controller):
-    global gripper_busy, cancel_pose_move, pose_moving
+    global cancel_pose_move, pose_moving, current_pose_target
     
     try:
         k = key.char.lower()
+        move = AXIS_MAP.get(k)
         
-        # Check if pose movement is active and movement key is pressed
-        if pose_moving and k in ['w', 's', 'a', 'd', 'q', 'e', 'i', 'k', 'j', 'l', 'u', 'o']:
-            print("⚠️  Cancelling pose movement for manual control...")
-            cancel_pose_move = True
-            # Also set velocity for immediate manual control
-            axis, direction = KEY_MAP[k]
+        if move:
+            # Check if pose movement is active and movement key is pressed
+            if pose_moving:
+                print("⚠️  Cancelling pose movement for manual control...")
+                cancel_pose_move = True
+            
+            # Handle robot movement keys (also immediate manual control after a cancel)
+            axis, direction = move
             with vel_lock:
                 if axis < 3:
                     velocity[axis] = direction * MAX_LIN_SPEED
                 else:
                     velocity[axis] = direction * MAX_ROT_SPEED
-            return
         
-        if k in KEY_MAP:
-            action = KEY_MAP[k]
-            
-            # Handle gripper commands
-            if isinstance(action, str):
-                if action in ['close', 'open', 'stop']:
-                    # Start gripper command in separate thread
-                    threading.Thread(target=gripper_command_thread, 
-                                   args=(action, gripper), 
-                                   daemon=True).start()
-                elif action.startswith('pose') or action in ['home', 'drop']:
-                    # Handle pose movement commands
-                    if pose_moving:
-                        print("⚠️  Already moving to a pose. Wait or cancel with movement key.")
-                    else:
-                        threading.Thread(target=pose_move_thread,
-                                       args=(k, controller),
-                                       daemon=True).start()
+        elif k in GRIPPER_MAP:
+            # Hand the gripper command to the gripper worker
+            if queue_command(gripper_queue, gripper_pending, GRIPPER_MAP[k]) is False:
+                print(f"⚠ Gripper is busy. Ignoring {GRIPPER_MAP[k]} command.")
+        
+        elif k in POSE_MAP:
+            # Handle pose movement commands. pose_moving is set here, before the worker
+            # takes the key, so the velocity loop stands down from the moment it's queued
+            if k == current_pose_target:
+                print(f"⚠️  Already moving to {POSE_TARGETS[k][0]}.")
+            elif pose_moving:
+                print("⚠️  Already moving to a pose. Wait or cancel with movement key.")
             else:
-                # Handle robot movement keys
-                axis, direction = action
-                with vel_lock:
-                    if axis < 3:
-                        velocity[axis] = direction * MAX_LIN_SPEED
-                    else:
-                        velocity[axis] = direction * MAX_ROT_SPEED
+                cancel_pose_move = False
+                pose_moving = True
+                current_pose_target = k
+                if not queue_command(pose_queue, pose_pending, k):
+                    current_pose_target = None
+                    pose_moving = False
+                    print("⚠️  Already moving to a pose. Wait or cancel with movement key.")
                         
     except AttributeError:
         if key == keyboard.Key.esc:
@@ -515,13 +837,11 @@ def on_press(key, gripper, controller):
 def on_release(key):
     try:
         k = key.char.lower()
-        if k in KEY_MAP:
-            action = KEY_MAP[k]
-            # Only reset velocity for movement keys
-            if isinstance(action, tuple):
-                axis, _ = action
-                with vel_lock:
-                    velocity[axis] = 0.0
+        # Only reset velocity for movement keys
+        move = AXIS_MAP.get(k)
+        if move:
+            with vel_lock:
+                velocity[move[0]] = 0.0
     except AttributeError:
         pass
 
@@ -541,7 +861,7 @@ print("  G: Close Gripper       H: Open Gripper  Y: Stop Gripper")
 print("\n⏹️  Controls:")
 print("  ESC: Quit program")
 print("  Movement keys during pose move: Cancel pose move")
-print("  Note: Pose moves wait 5 seconds after sending command")
+print("  Note: Pose moves finish when the robot reports it has stopped")
 print("="*60 + "\n")
 
 # Load poses from JSON file
@@ -558,7 +878,7 @@ print("🔌 Connecting to gripper...")
 if gripper.connect():
     gripper_connected = True
     # Verify connection by reading product info
-    product_code = gripper.read_holding_register(1536)
+    product_code = gripper.get_product_info()
     if product_code:
         if product_code == 0xC0:
             print("✓ Gripper: 2FG7 (13-31mm) detected")
@@ -575,6 +895,10 @@ else:
 robot_thread = threading.Thread(target=controller.loop, daemon=True)
 robot_thread.start()
 
+# Start the gripper and pose workers that key presses queue commands for
+threading.Thread(target=gripper_worker, args=(gripper,), daemon=True).start()
+threading.Thread(target=pose_worker, args=(controller,), daemon=True).start()
+
 # Create keyboard listener with gripper and controller as arguments
 listener = keyboard.Listener(
     on_press=lambda key: on_press(key, gripper, controller),
@@ -584,7 +908,7 @@ listener.start()
 
 print("✅ Ready for control. Press ESC to exit.")
 print("ℹ️  Tip: Press any movement key (WASD, etc.) during pose movement to cancel it.")
-print(f"ℹ️  Pose moves: Send command → Robot moves → Wait {POSE_WAIT_TIME}s → Ready\n")
+print(f"ℹ️  Pose moves: Send command → Robot moves → Robot stops → Ready\n")
 
 # Keep main thread alive
 try:
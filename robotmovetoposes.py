@@ -1,54 +1,233 @@
 import socket
+import struct
+import threading
 import time
 import json
 import os
+import queue
 import sys
+from collections import namedtuple
 
-# Try to import msvcrt for Windows key detection
+# Key presses come from msvcrt on Windows and a cbreak-mode terminal elsewhere
 try:
     import msvcrt
     WINDOWS = True
 except ImportError:
+    import termios
+    import tty
     WINDOWS = False
-    print("⚠️  Non-Windows system, key detection may not work.")
+
+# orjson parses several times faster than the stdlib and also reuses the repeated
+# "x"/"y"/"z"/... key strings across pose dicts; it stays optional
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Robot configuration
 ROBOT_IP = "192.168.1.20"
 MOVE_PORT = 30002
+STATE_PORT = 30003  # Real-time interface, used to see when a move has finished
 ACCELERATION = 0.3
 VELOCITY = 0.15
-MOVE_WAIT_TIME = 2.0  # seconds
+MOVE_WAIT_TIME = 2.0  # seconds; fixed wait when the state interface is unavailable
+MOVE_TIMEOUT = 20.0   # seconds; upper bound on a move when watching the state interface
+
+# Fixed script lines, encoded once
+HELLO_CMD = b'textmsg("Python script connected")\n'
+STOPL_CMD = b"stopl(2.0)\n"  # gentle deceleration
+
+# Socket options applied to the robot connection: (level, option, value).
+# Script lines are tiny complete messages, so Nagle only adds delay
+DEFAULT_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
 
 # JSON file path
 JSON_PATH = r"C:\Users\Shivam\Downloads\CameraChessWeb-main2\CameraChessWeb-main\public\chessboard_poses.json"
 
+# Poses are flat (x, y, z, rx, ry, rz) tuples once loaded
+Pose = namedtuple('Pose', 'x y z rx ry rz')
+MOVEL_FMT = b"movel(p[%.5f, %.5f, %.5f, %.5f, %.5f, %.5f], " + f"a={ACCELERATION}, v={VELOCITY})\n".encode()
+
+def to_pose(entry):
+    """Pose tuple from a JSON pose dict"""
+    return Pose(entry['x'], entry['y'], entry['z'], entry['rx'], entry['ry'], entry['rz'])
+
+def build_pose_command(pose, name=""):
+    """Encoded textmsg + movel lines for a pose (formatted once, sent as-is)"""
+    return f'textmsg("Moving to {name}")\n'.encode() + MOVEL_FMT % pose
+
+# Real-time interface (port 30003) layouts, compiled once
+_UR_PACKET_SIZE = struct.Struct('>I')  # 4-byte message size
+_JOINT_SPEEDS = struct.Struct('>6d')
+_DOUBLE = struct.Struct('>d')
+
+class URStateMonitor:
+    """Tracks program/motion state from the UR real-time interface (port 30003)"""
+    
+    QD_ACTUAL_OFFSET = 300      # Actual joint speeds, 6 doubles (rad/s)
+    PROGRAM_STATE_OFFSET = 1052  # Program state double; 2.0 = running
+    PROGRAM_RUNNING = 2.0
+    JOINT_STEADY_SPEED = 0.001  # rad/s; below this on every joint the arm counts as still
+    MOVE_START_TIMEOUT = 0.5    # A move that hasn't started by now is treated as already there
+    POLL_INTERVAL = 0.01
+    
+    def __init__(self, ip, port=STATE_PORT, socket_options=None):
+        self.ip = ip
+        self.port = port
+        self.socket_options = DEFAULT_SOCKET_OPTIONS + list(socket_options or [])
+        self.sock = None
+        self.active = False
+        # (packets seen, program running, joints moving); replaced as a whole by the reader
+        self.state = (0, False, False)
+        self._buf = bytearray(8192)
+    
+    def start(self):
+        """Connect and start the reader thread; False if the interface is unavailable"""
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            for option in self.socket_options:
+                self.sock.setsockopt(*option)
+            self.sock.settimeout(2.0)
+            self.sock.connect((self.ip, self.port))
+            self.sock.settimeout(0.5)
+        except Exception as e:
+            print(f"⚠️  State interface unavailable ({e}) - moves use a fixed {MOVE_WAIT_TIME}s wait")
+            self.sock = None
+            return False
+        
+        self.active = True
+        threading.Thread(target=self._run, daemon=True).start()
+        print(f"✓ State interface connected on port {self.port}")
+        return True
+    
+    def stop(self):
+        self.active = False
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+    
+    def _run(self):
+        """Reader thread: keep the state of the newest complete packet"""
+        buf = self._buf
+        length = 0
+        while self.active:
+            try:
+                nread = self.sock.recv_into(memoryview(buf)[length:])
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.active:
+                    print(f"⚠️  State stream error: {e}")
+                break
+            if not nread:
+                print("⚠️  State connection closed by robot")
+                break
+            length += nread
+            
+            sequence, running, moving = self.state
+            offset = 0
+            while length - offset >= 4:
+                packet_size = _UR_PACKET_SIZE.unpack_from(buf, offset)[0]
+                if packet_size < 4 or packet_size > len(buf):
+                    print(f"⚠️  Bad state packet size {packet_size}, state stream stopped")
+                    self.active = False
+                    return
+                if length - offset < packet_size:
+                    break  # Rest of the packet is still on the wire
+                
+                moving = False
+                if packet_size >= self.QD_ACTUAL_OFFSET + 48:
+                    speeds = _JOINT_SPEEDS.unpack_from(buf, offset + self.QD_ACTUAL_OFFSET)
+                    moving = max(abs(qd) for qd in speeds) > self.JOINT_STEADY_SPEED
+                running = False
+                if packet_size >= self.PROGRAM_STATE_OFFSET + 8:
+                    running = _DOUBLE.unpack_from(buf, offset + self.PROGRAM_STATE_OFFSET)[0] \
+                        == self.PROGRAM_RUNNING
+                sequence += 1
+                offset += packet_size
+            
+            if offset:
+                remaining = length - offset
+                if remaining:
+                    buf[:remaining] = buf[offset:length]
+                length = remaining
+                self.state = (sequence, running, moving)
+        self.active = False
+    
+    def wait_for_move(self, timeout, cancelled=lambda: False):
+        """
+        Wait until the move just sent has started and finished.
+        Returns True when done, False on timeout or cancel, None if the stream went away.
+        """
+        sent_seq = self.state[0]
+        start = time.monotonic()
+        started = False
+        while self.active:
+            if cancelled():
+                return False
+            time.sleep(self.POLL_INTERVAL)
+            elapsed = time.monotonic() - start
+            if elapsed > timeout:
+                return False  # Checked first: a stalled stream never sends the packet waited on
+            sequence, running, moving = self.state
+            if sequence == sent_seq:
+                continue  # No packet since the command went out yet
+            
+            if running or moving:
+                started = True
+            elif started or elapsed > self.MOVE_START_TIMEOUT:
+                return True
+        return None
+
+
 class RobotController:
-    def __init__(self, ip, port, poses):
+    def __init__(self, ip, port, poses, socket_options=None):
         self.ip = ip
         self.port = port
+        # Extra (level, option, value) tuples, e.g. SO_KEEPALIVE, on top of the defaults
+        self.socket_options = DEFAULT_SOCKET_OPTIONS + list(socket_options or [])
         self.socket = None
+        # Move completion feedback; without it moves fall back to a fixed wait
+        self.state_monitor = URStateMonitor(ip, STATE_PORT, socket_options)
         self.poses = poses
         self.running = True
+        # Keys pressed while a move is running; a waiting move gives way to them
+        self.keys = queue.Queue()
+        
+        # Poses don't change after loading: format their move commands once,
+        # keyed by the names interactive_loop() moves with
+        self.pose_commands = {}
+        for i, corner in enumerate(poses.get('corners', [])):
+            self.pose_commands[f"Corner {i + 1}"] = build_pose_command(corner, f"Corner {i + 1}")
+        for key, name in (('home', "Home"), ('drop', "Drop")):
+            if key in poses:
+                self.pose_commands[name] = build_pose_command(poses[key], name)
 
     def connect(self):
         print(f"🔌 Connecting to robot at {self.ip}:{self.port}...")
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            for option in self.socket_options:
+                self.socket.setsockopt(*option)
             self.socket.settimeout(10)
             self.socket.connect((self.ip, self.port))
             print(f"✅ Connected to robot")
-            self.send_command('textmsg("Python script connected")', wait_time=0.5)
+            self.state_monitor.start()
+            self.send_raw(HELLO_CMD, wait_time=0.5)
             return True
         except Exception as e:
             print(f"❌ Connection failed: {e}")
             return False
 
     def send_command(self, cmd, wait_time=0.1):
+        return self.send_raw((cmd + "\n").encode(), wait_time)
+
+    def send_raw(self, data, wait_time=0.1):
         if not self.socket:
             print("❌ Not connected")
             return False
         try:
-            self.socket.sendall((cmd + "\n").encode())
+            self.socket.sendall(data)
             time.sleep(wait_time)
             return True
         except Exception as e:
@@ -58,40 +237,58 @@ class RobotController:
     def move_to_pose(self, pose, name=""):
         if name:
             print(f"➡️  Moving to {name}...")
-        cmd = f"movel(p[{pose['x']:.5f}, {pose['y']:.5f}, {pose['z']:.5f}, {pose['rx']:.5f}, {pose['ry']:.5f}, {pose['rz']:.5f}], a={ACCELERATION}, v={VELOCITY})"
-        self.send_command(f'textmsg("Moving to {name}")', wait_time=0.1)
-        self.send_command(cmd, wait_time=0.1)
-        print(f"⏱️  Waiting {MOVE_WAIT_TIME}s...")
-        time.sleep(MOVE_WAIT_TIME)
-        print(f"✅ {name} reached")
-
-    def check_keypress(self):
-        if not WINDOWS:
-            return None
-        if msvcrt.kbhit():
-            key = msvcrt.getch()
-            try:
-                if isinstance(key, bytes):
-                    return key.decode("utf-8").lower()
-                return str(key).lower()
-            except:
-                return None
-        return None
+        cmd = self.pose_commands.get(name)
+        if cmd is None:
+            cmd = build_pose_command(pose, name)
+        start = time.monotonic()
+        self.send_raw(cmd, wait_time=0)
+        finished = None
+        if self.state_monitor.active:
+            # A queued key (SPACE to stop, 'q' to quit, another pose) ends the wait at once
+            finished = self.state_monitor.wait_for_move(MOVE_TIMEOUT,
+                                                        cancelled=lambda: not self.keys.empty())
+        if finished is None:
+            print(f"⏱️  Waiting {MOVE_WAIT_TIME}s...")
+            time.sleep(MOVE_WAIT_TIME)
+            finished = True
+        if finished:
+            print(f"✅ {name} reached ({time.monotonic() - start:.1f}s)")
+        elif not self.keys.empty():
+            print(f"⏭️  Stopped waiting for {name} - handling next key")
+        else:
+            print(f"⚠️  {name} not reached within {MOVE_TIMEOUT:.0f}s")
+
+    def read_keys(self, keys):
+        """Key reader thread: block until a key is pressed and queue it (None = input closed)"""
+        while True:
+            key = msvcrt.getwch() if WINDOWS else sys.stdin.read(1)
+            if not key:
+                keys.put(None)
+                return
+            keys.put(key.lower())
 
     def interactive_loop(self):
         print("🤖 Interactive robot control")
         print("Press number keys to move to corners, 'h' for home, 'd' for drop, 'space' to STOP, 'q' to quit")
         print("="*50)
         
-        while self.running:
-            key = self.check_keypress()
-            if key:
-                if key == 'q':
+        # Keys arrive from a reader thread, so the loop sleeps until one is pressed
+        keys = self.keys
+        saved_mode = None
+        if not WINDOWS and sys.stdin.isatty():
+            saved_mode = termios.tcgetattr(sys.stdin)
+            tty.setcbreak(sys.stdin)  # Deliver keys without Enter or echo
+        threading.Thread(target=self.read_keys, args=(keys,), daemon=True).start()
+        
+        try:
+            while self.running:
+                key = keys.get()
+                if key is None or key == 'q':
                     print("🛑 Quitting...")
                     self.running = False
                 elif key == ' ':
                     print("⚠️  SPACE pressed - EMERGENCY STOP!")
-                    self.send_command("stopl(2.0)")  # gentle deceleration
+                    self.send_raw(STOPL_CMD)
                 elif key == 'h' and 'home' in self.poses:
                     self.move_to_pose(self.poses['home'], "Home")
                 elif key == 'd' and 'drop' in self.poses:
@@ -104,15 +301,22 @@ class RobotController:
                         print(f"❌ Corner {key} not defined")
                 else:
                     print(f"⚠️ Unknown key '{key}' pressed")
-            time.sleep(0.05)
+        finally:
+            if saved_mode is not None:
+                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, saved_mode)
 
 
 def load_poses(json_path):
     if not os.path.exists(json_path):
         print(f"❌ JSON file not found: {json_path}")
         sys.exit(1)
-    with open(json_path, 'r') as f:
-        poses = json.load(f)
+    with open(json_path, 'rb') as f:
+        poses = _json_loads(f.read())
+    if 'corners' in poses:
+        poses['corners'] = [to_pose(corner) for corner in poses['corners']]
+    for key in ('home', 'drop'):
+        if key in poses:
+            poses[key] = to_pose(poses[key])
     return poses
 
 def main():
@@ -120,6 +324,7 @@ def main():
     controller = RobotController(ROBOT_IP, MOVE_PORT, poses)
     if controller.connect():
         controller.interactive_loop()
+    controller.state_monitor.stop()
     if controller.socket:
         controller.socket.close()
         print("✅ Disconnected from robot")
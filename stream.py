@@ -1,14 +1,63 @@
+import queue
+import threading
+import urllib.request
+
 import cv2
+import numpy as np
+
+STREAM_URL = "http://localhost:8080/video"
+CHUNK_SIZE = 65536
+MAX_PENDING_BYTES = 8 * 1024 * 1024  # Give up on a frame that never ends
+
+# Newest complete JPEG from the reader thread; None marks the end of the stream
+frames = queue.Queue(maxsize=1)
+
+
+def publish(item):
+    """Replace whatever frame is waiting, so the display always gets the newest one"""
+    try:
+        frames.get_nowait()
+    except queue.Empty:
+        pass
+    frames.put_nowait(item)
+
+
+def read_stream(url):
+    """Reader thread: split the MJPEG stream into JPEGs (SOI ... EOI) while the main thread decodes"""
+    buf = bytearray()
+    try:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            while True:
+                chunk = resp.read1(CHUNK_SIZE)
+                if not chunk:
+                    break
+                buf += chunk
+
+                end = buf.rfind(b"\xff\xd9")
+                if end < 0:
+                    if len(buf) > MAX_PENDING_BYTES:
+                        buf.clear()
+                    continue
+                start = buf.rfind(b"\xff\xd8", 0, end)
+                if start >= 0:
+                    publish(bytes(buf[start:end + 2]))
+                del buf[:end + 2]
+    except OSError as e:
+        print(f"Stream error: {e}")
+    publish(None)
+
 
-cap = cv2.VideoCapture("http://localhost:8080/video")
+threading.Thread(target=read_stream, args=(STREAM_URL,), daemon=True).start()
 
 while True:
-    ret, frame = cap.read()
-    if not ret:
+    jpeg = frames.get()
+    if jpeg is None:
         break
+    frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        continue
     cv2.imshow("MJPEG Stream", frame)
     if cv2.waitKey(1) & 0xFF == 27:
         break
 
-cap.release()
 cv2.destroyAllWindows()